@@ -1,3 +1,4 @@
+import os
 from datetime import datetime
 
 import pandas as pd
@@ -13,39 +14,59 @@ from parameters import updating_RudeSarcasm_result, classify_rude_sarcastic, \
     create_final_DSAT_results, classify_DSAT, classifyVoiceOfCustomer, classifyOpeningLang, processing_timely_closing, \
     calculate_row_language_percentage_spacy, classifyPersonalization, process_TimelyOpening, process_classification, \
     process_hold_data, apply_hold_logic, process_dead_air, merge_hold_and_dead_air, aggregate_dead_air_data, \
-    categorize_hold_status
+    categorize_hold_status, classify_brcp_fused, parse_fused_groups, process_fused_classification
 from resources.RefiningResults import merge_all_dataframes, main_processing_pipeline
 from resources.working_with_files import merge_dataframes, validate_SOFTSKILL_dataframe, \
     REQUIRED_COLUMNS_SOFTSKILL, validate_brcp_dataframe
 
+# Ask for Sarcasm, Escalation and Supervisor in one Gemini call per transcript instead of three
+BRCP_FUSED_MODE = os.getenv("BRCP_FUSED_MODE", "false").lower() == "true"
+
+# Group softskill parameters into one Gemini call per group and transcript. Groups are separated by ";",
+# parameters by ",". Fewer, larger groups mean fewer calls but longer prompts.
+SOFTSKILL_FUSED_MODE = os.getenv("SOFTSKILL_FUSED_MODE", "false").lower() == "true"
+SOFTSKILL_FUSED_GROUPS = parse_fused_groups(os.getenv(
+    "SOFTSKILL_FUSED_GROUPS",
+    "ApologyEmpathy,UnethicalSolicitation,Reassurance,Personalization;"
+    "ChatOpening,ChatClosing,OpeningLang,VoiceOfCustomer"
+))
+
 
 def analyse_data_using_gemini_for_brcp(df, uid, nowtime):
-    # Step 1: Sarcasm & Rudeness Classification
     rude_columns = ['Sarcasm_rude_behaviour', 'Sarcasm_rude_behaviour_evidence']
-    RudeSarcastic_res_df = process_classification(classify_rude_sarcastic, df, rude_columns, "Rude and Sarcastic")
-    # Apply result updates
-    RudeSarcastic_res_df = RudeSarcastic_res_df.apply(updating_RudeSarcasm_result, axis=1)
-
-    # Step 2: Escalation Processing
     escalation_columns = [
         'escalation_results', 'Issue_Identification', 'Probable_Reason_for_Escalation',
         'Probable_Reason_for_Escalation_Evidence', 'Agent_Handling_Capability'
     ]
-    escalation_res_df = process_classification(process_transcripts_escalation, df, escalation_columns, "Escalation")
-
-    # Step 3: Supervisor Classification
     supervisor_columns = [
         'Wanted_to_connect_with_supervisor', 'de_escalate', 'Supervisor_call_connected',
         'call_back_arranged_from_supervisor', 'supervisor_evidence',
         'Denied_for_Supervisor_call', 'denied_evidence'
     ]
-    supervisor_res_df = process_classification(classify_supervisor, df, supervisor_columns, "Supervisor Connect")
 
+    if BRCP_FUSED_MODE:
+        # Sarcasm & Rudeness, Escalation and Supervisor in a single Gemini call per transcript
+        fused_res_df = process_classification(classify_brcp_fused, df,
+                                              rude_columns + escalation_columns + supervisor_columns, "BRCP (fused)")
+        fused_res_df = fused_res_df.apply(updating_RudeSarcasm_result, axis=1)
+        parameter_dfs = [fused_res_df]
+    else:
+        # Step 1: Sarcasm & Rudeness Classification
+        RudeSarcastic_res_df = process_classification(classify_rude_sarcastic, df, rude_columns, "Rude and Sarcastic")
+        # Apply result updates
+        RudeSarcastic_res_df = RudeSarcastic_res_df.apply(updating_RudeSarcasm_result, axis=1)
+
+        # Step 2: Escalation Processing
+        escalation_res_df = process_classification(process_transcripts_escalation, df, escalation_columns,
+                                                   "Escalation")
+
+        # Step 3: Supervisor Classification
+        supervisor_res_df = process_classification(classify_supervisor, df, supervisor_columns, "Supervisor Connect")
+        parameter_dfs = [RudeSarcastic_res_df, escalation_res_df, supervisor_res_df]
 
     CRED_FINAL_OUTPUT = df[['conversation_id', 'request_id']]
-    for df, name in zip([RudeSarcastic_res_df, escalation_res_df, supervisor_res_df],
-                        ['RudeSarcastic', 'Escalation', 'Supervisor']):
-        CRED_FINAL_OUTPUT = merge_dataframes(CRED_FINAL_OUTPUT, df)
+    for parameter_df in parameter_dfs:
+        CRED_FINAL_OUTPUT = merge_dataframes(CRED_FINAL_OUTPUT, parameter_df)
 
     CRED_FINAL_OUTPUT.replace('nan', 'N/A', inplace=True)
 
@@ -101,17 +122,6 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
         print(error)
         reportError(error)
 
-    try:
-        transcriptChat_df = transcriptChat_df.sort_values(by=['request_id', 'id'])
-    except KeyError as e:
-        keyError = f"KeyError: Missing column {e} in transcriptChat_df"
-        print(keyError)
-        reportError(keyError)
-    except Exception as e:
-        error = f"Unexpected error while sorting transcriptChat_df: {e}"
-        print(error)
-        reportError(error)
-
     try:
         transcript_df = pd.merge(transcript_df, primaryInfo_df, how='inner')
     except KeyError as e:
@@ -167,6 +177,15 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
         print(error)
         reportError(error)
 
+    # Fused mode: classify the grouped parameters with one Gemini call per group and transcript
+    fused_res_dfs = process_fused_classification(transcript_df, SOFTSKILL_FUSED_GROUPS) \
+        if SOFTSKILL_FUSED_MODE else {}
+
+    def classify_parameter(fused_name, classification_func, columns, classification_name):
+        if fused_name in fused_res_dfs:
+            return fused_res_dfs[fused_name]
+        return process_classification(classification_func, transcript_df, columns, classification_name)
+
     # Step 1: Language Switch Parameter
     langSwitch_df = classify_langSwitch(transcriptChat_df)
 
@@ -174,27 +193,27 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
     empathy_columns = ['Apology_result', 'Apology_evidence', 'Empathy_result', 'Empathy_evidence',
                        'Apology_Category', 'Empathy_Category']
 
-    Empathy_apology_res_df = process_classification(classifyApologyEmpathy, transcript_df, empathy_columns,
-                                                    "Apology and Empathy")
+    Empathy_apology_res_df = classify_parameter('ApologyEmpathy', classifyApologyEmpathy, empathy_columns,
+                                                "Apology and Empathy")
     # Step 3: Unethical Solicitation
     unethical_columns = ['Unethical_Solicitation', 'Unethical_Solicitation_Evidence']
-    Unethical_Solicitation_res_df = process_classification(classifyUnethicalSolicitation, transcript_df,
-                                                           unethical_columns, "Unethical Solicitaion")
+    Unethical_Solicitation_res_df = classify_parameter('UnethicalSolicitation', classifyUnethicalSolicitation,
+                                                       unethical_columns, "Unethical Solicitaion")
 
     # Step 4: Reassurance Parameter
     Reassurance_columns = ['Reassurance_result', 'Reassurance_evidence', 'Reassurance_Category']
-    Reassurance_res_df = process_classification(classifyReassurance, transcript_df, Reassurance_columns, "Reassurance")
+    Reassurance_res_df = classify_parameter('Reassurance', classifyReassurance, Reassurance_columns, "Reassurance")
 
     # Step 5: Call Closing Parameter
     ChatClosing_columns = ["Further Assistance", "Further Assistance Evidence", "Effective IVR Survey",
                            "Effective IVR Survey Evidence", "Branding", "Branding Evidence", "Greeting",
                            "Greeting Evidence"]
-    ChatClosing_res_df = process_classification(classifyChatClosing, transcript_df, ChatClosing_columns, "Chat Closing")
+    ChatClosing_res_df = classify_parameter('ChatClosing', classifyChatClosing, ChatClosing_columns, "Chat Closing")
 
     # Step 6: Call Opening Parameter
     ChatOpening_columns = ["Greeting_the_customer", "Greeting_the_customer_evidence", "Self_introduction",
                            "Self_introduction_evidence", "Identity_confirmation", "Identity_confirmation_evidence"]
-    ChatOpening_res_df = process_classification(classifyChatOpening, transcript_df, ChatOpening_columns, "Chat Opening")
+    ChatOpening_res_df = classify_parameter('ChatOpening', classifyChatOpening, ChatOpening_columns, "Chat Opening")
 
     # Step 7: Survey Pitch Parameter
     Survey_res_df = ChatClosing_res_df[['request_id', "Effective IVR Survey", "Effective IVR Survey Evidence"]].rename(
@@ -222,8 +241,8 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
 
     # Step 9: Voice Of Customer Parameter
     voice_of_customer_columns = ['VOC_Category', 'VOC_Core_Issue_Summary']
-    voice_of_customer_res_df = process_classification(classifyVoiceOfCustomer, transcript_df, voice_of_customer_columns,
-                                                      "Voice Of Customer")
+    voice_of_customer_res_df = classify_parameter('VoiceOfCustomer', classifyVoiceOfCustomer,
+                                                  voice_of_customer_columns, "Voice Of Customer")
 
     # Convert request_id to string for proper mapping
     voice_of_customer_res_df['request_id'] = voice_of_customer_res_df['request_id'].astype(str)
@@ -243,8 +262,8 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
     # Step 10: Opening Language Parameter
     opening_lang_columns = ['Open the call in default language', 'Open the call in default language evidence',
                             'Open the call in default language Reason']
-    opening_lang_res_df = process_classification(classifyOpeningLang, transcript_df, opening_lang_columns,
-                                                 "Open the call in default language")
+    opening_lang_res_df = classify_parameter('OpeningLang', classifyOpeningLang, opening_lang_columns,
+                                             "Open the call in default language")
 
     # Step 9: Timely CLosing Parameter
     timely_closing_res_df = processing_timely_closing(primaryInfo_df, transcript_df, transcriptChat_df, "surveypoint")
@@ -269,7 +288,8 @@ def analyse_data_for_soft_skill(primaryInfo_df, transcript_df, transcriptChat_df
     # Step 11: Personalization Parameter
 
     Personalization_columns = ['Personalization_result', 'Personalization_Evidence']
-    Personalization_res_df = process_classification(classifyPersonalization, transcript_df, Personalization_columns, "Personalization")
+    Personalization_res_df = classify_parameter('Personalization', classifyPersonalization, Personalization_columns,
+                                                "Personalization")
     print("personalization done")
 
     timelyOpening_df = process_TimelyOpening(transcriptChat_df)
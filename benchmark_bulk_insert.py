@@ -0,0 +1,60 @@
+import sys
+import time
+
+import pandas as pd
+
+from fetchData import get_connection, OUTPUT_DATABASE, bulk_insert, dataframe_to_tuples, BRCP_DATA_COLUMNS
+
+# Compares the old iterrows + executemany upload with the bulk insert modes, on a session temp table
+# Usage: python benchmark_bulk_insert.py [rows]
+
+
+def make_sample_df(rows):
+    evidence = "The agent said 'I understand your concern, let me check that for you' and resolved the issue. " * 3
+    data = {column: [f"{column}_{i}" if "evidence" not in column.lower() else evidence for i in range(rows)]
+            for column in BRCP_DATA_COLUMNS}
+    return pd.DataFrame(data)
+
+
+def run_benchmark(rows=5000):
+    df = make_sample_df(rows).fillna("N/A")
+    conn = get_connection(OUTPUT_DATABASE)
+    if conn is None:
+        print("Database connection failed!")
+        return
+
+    column_definitions = ", ".join(f"{column} NVARCHAR(MAX)" for column in BRCP_DATA_COLUMNS)
+    insert_query = f"""
+        INSERT INTO #brcp_benchmark ({", ".join(BRCP_DATA_COLUMNS)})
+        VALUES ({", ".join("?" * len(BRCP_DATA_COLUMNS))})
+    """
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE TABLE #brcp_benchmark ({column_definitions})")
+
+        # Old path: a Series per row and one round trip per row
+        start = time.perf_counter()
+        data_tuples = [tuple(row) for _, row in df.iterrows()]
+        cursor.executemany(insert_query, data_tuples)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        print(f"iterrows + executemany: {rows / elapsed:,.0f} rows/s ({elapsed:.2f}s)")
+
+        for mode in ["executemany", "multirow", "fast_executemany"]:
+            cursor.execute("TRUNCATE TABLE #brcp_benchmark")
+            conn.commit()
+            start = time.perf_counter()
+            bulk_insert(conn, insert_query, dataframe_to_tuples(df), mode=mode)
+            conn.commit()
+            elapsed = time.perf_counter() - start
+            print(f"itertuples + {mode}: {rows / elapsed:,.0f} rows/s ({elapsed:.2f}s)")
+
+        cursor.execute("DROP TABLE #brcp_benchmark")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
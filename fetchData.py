@@ -1,9 +1,16 @@
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
 from dotenv import load_dotenv
 import pandas as pd
-import pyodbc
 from ZulipMessenger import reportSuccessMsgBRCP, reportError, reportStatus, reportSuccessMsgSoftSkill
+from resources.connection_pool import ConnectionPool
+from resources.sql_backend import create_backend
+from resources.utterance_store import UtteranceStore, apply_load_dtypes
+from resources.working_with_files import now_ist
 
 load_dotenv()
 
@@ -15,21 +22,218 @@ DRIVER = os.getenv("DB_DRIVER", "{ODBC Driver 17 for SQL Server}")
 INPUT_DATABASE = os.getenv("INPUT_DATABASE")
 OUTPUT_DATABASE = os.getenv("OUTPUT_DATABASE")
 
+# "mssql" (SQL Server through pyodbc) or "sqlite" (local files in SQLITE_DB_DIR, seeded by seed_local_database.py)
+DB_BACKEND = os.getenv("DB_BACKEND", "mssql")
+SQLITE_DB_DIR = os.getenv("SQLITE_DB_DIR", "local_db")
+backend = create_backend(DB_BACKEND, server=SERVER, username=USERNAME, password=PASSWORD, driver=DRIVER,
+                         sqlite_directory=SQLITE_DB_DIR)
+
 max_retries = 20
 retry_delay = 5  # Seconds
+max_retry_delay = 60  # Seconds
+
+# Connection pool per database, shared by every fetch, upload and UID check of the process
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "60"))
+
+# Bulk insert: "fast_executemany" (parameter arrays, one round trip per batch), "multirow" (set-based
+# INSERT ... VALUES (...), (...) statements) or "executemany" (pyodbc default, one round trip per row)
+DB_BULK_INSERT_MODE = os.getenv("DB_BULK_INSERT_MODE", "fast_executemany")
+DB_BULK_INSERT_BATCH_ROWS = int(os.getenv("DB_BULK_INSERT_BATCH_ROWS", "5000"))
+SQL_SERVER_MAX_PARAMETERS = 2100
+SQL_SERVER_MAX_VALUES_ROWS = 1000
+
+# tutterances is streamed in chunks of this many rows into an UtteranceStore
+UTTERANCE_CHUNK_ROWS = int(os.getenv("UTTERANCE_CHUNK_ROWS", "50000"))
+
+# Columns fetch_data_softskill reads from each input table, the only ones the softskill analysis uses
+SOFTSKILL_FETCH_COLUMNS = {
+    "tPrimaryInfo": ["conversation_id", "request_id", "uploaded_id", "uploaded_on", "Time_duration_of_Call",
+                     "Total_instance_long_dead_Air", "Total_instance_short_dead_Air"],
+    "tTranscript": ["request_id", "transcript"],
+    # speaker ('00'/'01') and the Dear_Air flags are compared as stored, so they keep their database types
+    "tutterances": ["id", "request_id", "transcript", "speaker", "starttime", "Endtime", "Holddiff",
+                    "Dear_Air_short", "Dear_Air_long"],
+}
+PRIMARY_INFO_NUMERIC_COLUMNS = ["Time_duration_of_Call", "Total_instance_long_dead_Air",
+                                "Total_instance_short_dead_Air"]
+
+# Backlog mode of /brcp looks this far back (IST) for uploads that never made it into brcpData; 0 checks every upload
+BRCP_BACKLOG_LOOKBACK_HOURS = int(os.getenv("BRCP_BACKLOG_LOOKBACK_HOURS", "0"))
+
+# fetch_data_softskill status when an incremental run has nothing left to score
+NO_UNSCORED_CALLS = "No unscored calls found"
+
+# Result tables, in the column order of the DataFrames uploaded into them
+BRCP_DATA_COLUMNS = [
+    "conversation_id", "request_id", "Sarcasm_rude_behaviour", "Sarcasm_rude_behaviour_evidence",
+    "escalation_results", "Issue_Identification", "Probable_Reason_for_Escalation",
+    "Probable_Reason_for_Escalation_Evidence", "Agent_Handling_Capability",
+    "Wanted_to_connect_with_supervisor", "de_escalate", "Supervisor_call_connected",
+    "call_back_arranged_from_supervisor", "supervisor_evidence", "Denied_for_Supervisor_call",
+    "denied_evidence", "Today_Date", "Uploaded_id"
+]
+BRCP_DATA_KEYS = ["request_id", "Uploaded_id"]
+
+SOFTSKILL_COLUMNS = [
+    "conversation_id", "request_id", "hold_request_found", "hold_evidence",
+    "CustomerLangCount", "AgentLangCount", "language_switch", "Reassurance_result",
+    "Reassurance_evidence", "Apology_result", "Apology_evidence", "Empathy_result",
+    "Empathy_evidence", "No_Survey_Pitch", "No_Survey_Pitch_Evidence",
+    "Unethical_Solicitation", "Unethical_Solicitation_Evidence", "DSAT_result",
+    "Customer_Issue_Identification", "Reason_for_DSAT", "Suggestion_for_DSAT_Prevention",
+    "DSAT_Category", "Open_the_call_in_default_language", "Open_the_call_in_default_language_evidence",
+    "Open_the_call_in_default_language_Reason", "Hold_requested_before_dead_air",
+    "long_dead_air", "dead_air_timestamp", "VOC_Category", "VOC_Core_Issue_Summary",
+    "timely_closing_result", "timely_closing_evidence", "hold_ended_in_required_duration",
+    "hold_ended_in_required_duration_evidence", "hold_durations_after_hold_request",
+    "language_switch_result", "Call_Opening_Category", "default_opening_lang_Category",
+    "Apology_Category", "Empathy_Category", "Chat_Closing_Category", "language_switch_category",
+    "Hold_category", "Reassurance_Category", "Language", "Personalization_result",
+    "Personalization_Evidence", "Delayed_call_opening", "Delayed_call_opening_evidence",
+    "Further_Assistance", "Further_Assistance_Evidence", "Effective_IVR_Survey",
+    "Effective_IVR_Survey_Evidence", "Branding", "Branding_Evidence", "Greeting",
+    "Greeting_Evidence", "Greeting_the_customer", "Greeting_the_customer_evidence",
+    "Self_introduction", "Self_introduction_evidence", "Identity_confirmation",
+    "Identity_confirmation_evidence"
+]
+SOFTSKILL_KEYS = ["request_id"]
+
+# Results are MERGEd on their keys (re-runs update instead of duplicating); false keeps the plain INSERT
+DB_UPSERT_ENABLED = os.getenv("DB_UPSERT_ENABLED", "true").lower() == "true"
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(DATABASE):
+    """Return the connection pool of a database, creating it on first use."""
+    with _pools_lock:
+        if DATABASE not in _pools:
+            _pools[DATABASE] = ConnectionPool(
+                lambda: backend.connect(DATABASE),
+                min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE,
+                max_idle_seconds=DB_POOL_MAX_IDLE_SECONDS, checkout_timeout=DB_POOL_TIMEOUT
+            )
+        return _pools[DATABASE]
+
+
+def get_pool_stats():
+    """Return the connection pool statistics of every database used so far."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {database: pool.stats() for database, pool in pools.items()}
+
 
 def get_connection(DATABASE):
-    """Establish a database connection with retries."""
+    """
+    Check out a pooled database connection with retries.
+
+    Calling close() on the returned connection hands it back to the pool.
+    """
+    pool = get_pool(DATABASE)
     for attempt in range(1, max_retries + 1):
         try:
-            return pyodbc.connect(
-                f"DRIVER={DRIVER};SERVER={SERVER};DATABASE={DATABASE};UID={USERNAME};PWD={PASSWORD};"
-            )
+            return pool.acquire()
         except Exception as e:
             reportError(f"[Attempt {attempt}/{max_retries}] Failed to connect to {DATABASE}: {e}")
-            time.sleep(retry_delay * attempt)
+            time.sleep(min(retry_delay * 2 ** (attempt - 1), max_retry_delay))
     return None
 
+def dataframe_to_tuples(df):
+    """Rows of a DataFrame as plain tuples, without building a Series per row."""
+    return list(df.itertuples(index=False, name=None))
+
+
+def bulk_insert(conn, insert_query, data_tuples, mode=None):
+    """
+    Insert `data_tuples` with a parameterised "INSERT ... VALUES (?, ...)" query using the bulk load mode.
+
+    The caller commits or rolls back. Returns the number of rows sent.
+    """
+    mode = mode or DB_BULK_INSERT_MODE
+    if not data_tuples:
+        return 0
+
+    cursor = conn.cursor()
+    try:
+        if mode == "multirow":
+            # Stay under SQL Server's limits of 2100 parameters and 1000 rows per VALUES clause
+            width = len(data_tuples[0])
+            values_start = insert_query.upper().rindex("VALUES")
+            values_end = insert_query.index(")", values_start) + 1
+            prefix = insert_query[:values_start] + "VALUES "
+            suffix = insert_query[values_end:]  # e.g. an ON CONFLICT clause
+            row_placeholder = f"({', '.join('?' * width)})"
+            rows_per_statement = max(1, min(SQL_SERVER_MAX_VALUES_ROWS, (SQL_SERVER_MAX_PARAMETERS - 1) // width))
+            for start in range(0, len(data_tuples), rows_per_statement):
+                chunk = data_tuples[start:start + rows_per_statement]
+                cursor.execute(prefix + ", ".join([row_placeholder] * len(chunk)) + suffix,
+                               [value for row in chunk for value in row])
+        else:
+            if hasattr(cursor, "fast_executemany"):  # pyodbc only
+                cursor.fast_executemany = mode == "fast_executemany"
+            for start in range(0, len(data_tuples), DB_BULK_INSERT_BATCH_ROWS):
+                cursor.executemany(insert_query, data_tuples[start:start + DB_BULK_INSERT_BATCH_ROWS])
+    finally:
+        cursor.close()
+    return len(data_tuples)
+
+
+@contextmanager
+def temp_id_table(conn, table_name, source_table, source_column, ids):
+    """
+    Load `ids` into the session temp table `table_name` (one indexed `id` column typed like
+    `source_table.source_column`) so queries can join against it instead of inlining an IN (...) list. Yields the
+    backend's name of the table (backend.temp_table), which is dropped on exit since pooled connections keep their
+    session.
+    """
+    table_name = backend.temp_table(table_name)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(backend.drop_table_if_exists(table_name))
+        create_table, create_index = backend.create_id_table(table_name, source_table, source_column)
+        cursor.execute(create_table)
+        bulk_insert(conn, f"INSERT INTO {table_name} (id) VALUES (?)", [(value,) for value in ids])
+        cursor.execute(create_index)
+        yield table_name
+    finally:
+        try:
+            cursor.execute(backend.drop_table_if_exists(table_name))
+        finally:
+            cursor.close()
+
+
+def upsert_rows(conn, table, columns, key_columns, data_tuples, hash_exclude=()):
+    """
+    Idempotently write `data_tuples` (in `columns` order) to `table`, keyed on `key_columns`, and commit.
+
+    On SQL Server rows go through a session staging table and a MERGE: new keys are inserted, existing keys are
+    updated only when the content hash (ignoring `hash_exclude`) differs, and unchanged rows are not written at all
+    (backend.upsert). Every row is sent, so rows deleted or edited in the database since the last run are written
+    again. Returns a dict of counts per action (inserted/updated on SQL Server, written on SQLite) and skipped.
+    """
+    hashed_columns = [column for column in columns if column not in hash_exclude]
+    counts = dict(backend.upsert(conn, table, columns, key_columns, hashed_columns, data_tuples, bulk_insert)) \
+        if data_tuples else {}
+    counts["skipped"] = len(data_tuples) - sum(counts.values())
+    conn.commit()
+    return counts
+
+
+def write_result_rows(conn, table, columns, key_columns, data_tuples, hash_exclude=()):
+    """Write result rows with upsert_rows, or with a plain bulk INSERT when DB_UPSERT_ENABLED is off, and commit."""
+    if DB_UPSERT_ENABLED:
+        counts = upsert_rows(conn, table, columns, key_columns, data_tuples, hash_exclude)
+        print(f"{table}: " + ", ".join(f"{count} {action}" for action, count in counts.items()))
+        return
+    insert_query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    bulk_insert(conn, insert_query, data_tuples)
+    conn.commit()
+
+
 def upload_cred_result_on_database(final_df, uid, created_on):
     """Insert DataFrame into the database with retry mechanism."""
       # seconds
@@ -39,25 +243,13 @@ def upload_cred_result_on_database(final_df, uid, created_on):
         return "Database connection failed!"
 
     final_df = final_df.fillna(value="N/A")  # Handle NaN values once
-    data_tuples = [tuple(row) for _, row in final_df.iterrows()]
-
-    insert_query = """
-    INSERT INTO brcpData (
-        conversation_id, request_id, Sarcasm_rude_behaviour, Sarcasm_rude_behaviour_evidence,
-        escalation_results, Issue_Identification, Probable_Reason_for_Escalation,
-        Probable_Reason_for_Escalation_Evidence, Agent_Handling_Capability,
-        Wanted_to_connect_with_supervisor, de_escalate, Supervisor_call_connected,
-        call_back_arranged_from_supervisor, supervisor_evidence, Denied_for_Supervisor_call,
-        denied_evidence, Today_Date, Uploaded_id
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
+    data_tuples = dataframe_to_tuples(final_df)
 
     try:
         for attempt in range(1, max_retries + 1):
             try:
-                with conn.cursor() as cursor:
-                    cursor.executemany(insert_query, data_tuples)
-                conn.commit()
+                write_result_rows(conn, "brcpData", BRCP_DATA_COLUMNS, BRCP_DATA_KEYS, data_tuples,
+                                  hash_exclude=["Today_Date"])
                 reportSuccessMsgBRCP(uid, created_on)
                 return "Data inserted successfully!"
             except Exception as e:
@@ -118,37 +310,9 @@ def upload_softskill_result_on_database(df, date):
             continue  # Retry if connection fails
 
         try:
-            cursor = conn.cursor()
-            insert_query = """
-                INSERT INTO softskill (
-                    conversation_id, request_id, hold_request_found, hold_evidence,
-                    CustomerLangCount, AgentLangCount, language_switch, Reassurance_result,
-                    Reassurance_evidence, Apology_result, Apology_evidence, Empathy_result,
-                    Empathy_evidence, No_Survey_Pitch, No_Survey_Pitch_Evidence, 
-                    Unethical_Solicitation, Unethical_Solicitation_Evidence, DSAT_result, 
-                    Customer_Issue_Identification, Reason_for_DSAT, Suggestion_for_DSAT_Prevention, 
-                    DSAT_Category, Open_the_call_in_default_language, Open_the_call_in_default_language_evidence, 
-                    Open_the_call_in_default_language_Reason, Hold_requested_before_dead_air, 
-                    long_dead_air, dead_air_timestamp, VOC_Category, VOC_Core_Issue_Summary, 
-                    timely_closing_result, timely_closing_evidence, hold_ended_in_required_duration, 
-                    hold_ended_in_required_duration_evidence, hold_durations_after_hold_request, 
-                    language_switch_result, Call_Opening_Category, default_opening_lang_Category, 
-                    Apology_Category, Empathy_Category, Chat_Closing_Category, language_switch_category, 
-                    Hold_category, Reassurance_Category, Language, Personalization_result, 
-                    Personalization_Evidence, Delayed_call_opening, Delayed_call_opening_evidence, 
-                    Further_Assistance, Further_Assistance_Evidence, Effective_IVR_Survey, 
-                    Effective_IVR_Survey_Evidence, Branding, Branding_Evidence, Greeting, 
-                    Greeting_Evidence, Greeting_the_customer, Greeting_the_customer_evidence, 
-                    Self_introduction, Self_introduction_evidence, Identity_confirmation, 
-                    Identity_confirmation_evidence
-                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,
-                ?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-            """
-
             df = df.fillna("N/A").astype(str)
-            data_tuples = [tuple(row) for _, row in df.iterrows()]
-            cursor.executemany(insert_query, data_tuples)
-            conn.commit()
+            data_tuples = dataframe_to_tuples(df)
+            write_result_rows(conn, "softskill", SOFTSKILL_COLUMNS, SOFTSKILL_KEYS, data_tuples)
             reportSuccessMsgSoftSkill(date)
             return "Data inserted successfully!"
 
@@ -162,108 +326,270 @@ def upload_softskill_result_on_database(df, date):
 
     return "Data insertion failed after retries!"
 
-def fetch_data_softskill(date):
-    """Fetch softskill-related data with retries."""
+def read_with_retries(database, query_name, read):
+    """
+    Run `read(conn)` on a pooled connection of `database`, retrying only this query on failure.
+
+    Returns the result and the seconds the successful attempt took.
+    """
     for attempt in range(1, max_retries + 1):
+        conn = get_connection(database)
+        if conn is None:
+            raise Exception(f"Database connection failed for {query_name}!")
+
+        start = time.perf_counter()
         try:
-            primary_conn = get_connection(INPUT_DATABASE)
-            interaction_conn = get_connection(OUTPUT_DATABASE)
+            return read(conn), round(time.perf_counter() - start, 2)
+        except Exception as e:
+            reportError(f"[Attempt {attempt}/{max_retries}] {query_name} failed: {e}")
+            time.sleep(min(retry_delay * 2 ** (attempt - 1), max_retry_delay))
+        finally:
+            conn.close()
 
-            if not primary_conn or not interaction_conn:
-                raise Exception("Database connection failed!")
+    raise Exception(f"{query_name} failed after {max_retries} attempts!")
 
-            primary_info_query = """
-                SELECT * FROM tPrimaryInfo WHERE CONVERT(DATE, uploaded_on) = ?
-            """
-            primary_info_df = pd.read_sql(primary_info_query, primary_conn, params=[date])
 
-            if primary_info_df.empty:
-                raise Exception(f"No data found for date {date} in tPrimaryInfo.")
+def get_scored_request_ids(request_ids):
+    """Return the request IDs (as strings) among `request_ids` that already have a row in softskill."""
+    def read(conn):
+        with temp_id_table(conn, "candidate_ids", "softskill", "request_id", request_ids) as candidate_ids:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT c.id FROM {candidate_ids} c
+                WHERE EXISTS (SELECT 1 FROM softskill s WHERE s.request_id = c.id);
+            """)
+            return {str(row[0]) for row in cursor.fetchall()}
 
-            request_ids_tuple = tuple(primary_info_df["request_id"].unique())
-            conversation_id_tuple = tuple(primary_info_df["conversation_id"].unique())
+    scored, _ = read_with_retries(OUTPUT_DATABASE, "softskill", read)
+    return scored
 
-            interaction_data_query = f"""
-                SELECT conversationid, totalholdtime, calldisconnectionby, surveypoint 
-                FROM interactiondb WHERE conversationid IN {str(conversation_id_tuple)}
-            """
-            transcript_query = f"SELECT * FROM tTranscript WHERE request_id IN {str(request_ids_tuple)}"
-            transcriptchat_query = f"SELECT * FROM tutterances WHERE request_id IN {str(request_ids_tuple)}"
 
-            interaction_data_df = pd.read_sql(interaction_data_query, interaction_conn)
-            transcript_df = pd.read_sql(transcript_query, primary_conn)
-            transcriptchat_df = pd.read_sql(transcriptchat_query, primary_conn)
+def fetch_data_softskill(date, incremental=False):
+    """
+    Fetch softskill-related data with retries.
 
-            primary_info_df = primary_info_df.merge(
-                interaction_data_df, left_on="conversation_id", right_on="conversationid", how="inner"
-            ).drop(columns=["conversationid"])
+    tPrimaryInfo is read first for the IDs of the day; interactiondb, tTranscript and tutterances are then read
+    concurrently on their own pooled connections, each retried on its own. Only SOFTSKILL_FETCH_COLUMNS are
+    selected, numeric columns (including the tutterances timing columns, as float64) are converted while loading and
+    transcripts are stored as TEXT_DTYPE (Arrow strings, pyarrow is in requirements.txt). With `incremental`, calls
+    that already have a row in softskill are left out, so the day can be processed in several runs.
+    """
+    def select_columns(table, alias):
+        return ", ".join(f"{alias}.{column}" for column in SOFTSKILL_FETCH_COLUMNS[table])
+
+    def read_primary_info(conn):
+        # A half-open range on the raw column instead of CONVERT(DATE, ...), which works on every backend
+        primary_info_query = f"""
+            SELECT {select_columns("tPrimaryInfo", "p")} FROM tPrimaryInfo p
+            WHERE p.uploaded_on >= ? AND p.uploaded_on < ?
+        """
+        df = pd.read_sql(primary_info_query, conn, params=[date, date + timedelta(days=1)])
+        # An intra-day run may simply come before the first upload of the day
+        if df.empty and not incremental:
+            raise Exception(f"No data found for date {date} in tPrimaryInfo.")
+        return apply_load_dtypes(df, numeric_columns=PRIMARY_INFO_NUMERIC_COLUMNS)
 
-            primary_info_df.drop_duplicates(subset=["request_id"], inplace=True)
-            reportStatus(f"Data Fetching Success with columns: {list(primary_info_df.columns)}")
-            return primary_info_df, transcript_df, transcriptchat_df, "Fetched Data Successfully"
+    try:
+        primary_info_df, primary_info_seconds = read_with_retries(INPUT_DATABASE, "tPrimaryInfo", read_primary_info)
+        if incremental and not primary_info_df.empty:
+            scored = get_scored_request_ids(primary_info_df["request_id"].dropna().unique().tolist())
+            primary_info_df = primary_info_df[~primary_info_df["request_id"].astype(str).isin(scored)]
+            print(f"Incremental run: {len(scored)} calls already scored, {len(primary_info_df)} left")
+    except Exception as e:
+        reportError(f"Error: {e}")
+        return None, None, None, "Data fetching failed after retries!"
+
+    if primary_info_df.empty:
+        reportStatus(f"No unscored calls found for {date}.")
+        return None, None, None, NO_UNSCORED_CALLS
+
+    request_ids = primary_info_df["request_id"].dropna().unique().tolist()
+    conversation_ids = primary_info_df["conversation_id"].dropna().unique().tolist()
+
+    # The ID sets are joined server-side from temp tables, so the SQL text does not grow with the day
+    conversation_ids_table = backend.temp_table("conversation_ids")
+    request_ids_table = backend.temp_table("request_ids")
+    interaction_data_query = f"""
+        SELECT i.conversationid, i.totalholdtime, i.calldisconnectionby, i.surveypoint 
+        FROM interactiondb i INNER JOIN {conversation_ids_table} c ON i.conversationid = c.id
+    """
+    transcript_query = f"""
+        SELECT {select_columns("tTranscript", "t")}
+        FROM tTranscript t INNER JOIN {request_ids_table} r ON t.request_id = r.id
+    """
+    transcriptchat_query = f"""
+        SELECT {select_columns("tutterances", "u")}
+        FROM tutterances u INNER JOIN {request_ids_table} r ON u.request_id = r.id
+        ORDER BY u.request_id, u.id
+    """
 
-        except Exception as e:
-            reportError(f"[Attempt {attempt}/{max_retries}] Error: {e}")
-            time.sleep(retry_delay * attempt)
+    def read_joined(query, table_name, source_table, source_column, ids, text_columns=()):
+        def read(conn):
+            with temp_id_table(conn, table_name, source_table, source_column, ids):
+                return apply_load_dtypes(pd.read_sql(query, conn), text_columns=text_columns)
+        return read
+
+    def read_utterances(conn):
+        # Streamed with fetchmany so only one chunk of raw rows is in memory at a time
+        with temp_id_table(conn, "request_ids", "tTranscript", "request_id", request_ids):
+            store = UtteranceStore()
+            for chunk in pd.read_sql(transcriptchat_query, conn, chunksize=UTTERANCE_CHUNK_ROWS):
+                store.append(chunk)
+            return store.to_frame()
+
+    reads = {
+        "interactiondb": (OUTPUT_DATABASE, read_joined(interaction_data_query, "conversation_ids", "interactiondb",
+                                                       "conversationid", conversation_ids)),
+        "tTranscript": (INPUT_DATABASE, read_joined(transcript_query, "request_ids", "tTranscript", "request_id",
+                                                    request_ids, text_columns=["transcript"])),
+        "tutterances": (INPUT_DATABASE, read_utterances),
+    }
+    try:
+        with ThreadPoolExecutor(max_workers=len(reads)) as executor:
+            futures = {name: executor.submit(read_with_retries, database, name, read)
+                       for name, (database, read) in reads.items()}
+            results = {name: future.result() for name, future in futures.items()}
+    except Exception as e:
+        reportError(f"Error: {e}")
+        return None, None, None, "Data fetching failed after retries!"
 
-        finally:
-            for conn in [primary_conn, interaction_conn]:
-                if conn:
-                    conn.close()
+    interaction_data_df, transcript_df, transcriptchat_df = (results[name][0] for name in reads)
+    timings = {"tPrimaryInfo": primary_info_seconds, **{name: results[name][1] for name in reads}}
 
-    return None, None, None, "Data fetching failed after retries!"
+    primary_info_df = primary_info_df.merge(
+        interaction_data_df, left_on="conversation_id", right_on="conversationid", how="inner"
+    ).drop(columns=["conversationid"])
 
+    primary_info_df.drop_duplicates(subset=["request_id"], inplace=True)
+    reportStatus(f"Data Fetching Success with columns: {list(primary_info_df.columns)}\n"
+                 f"Query timings (s): {timings}")
+    return primary_info_df, transcript_df, transcriptchat_df, "Fetched Data Successfully"
 
-def get_latest_uid(database):
-    """Fetch the latest uploaded_id and created_on timestamp from Conversation_ID_List with retries."""
+
+# Conversation_ID_List.id of the newest upload already confirmed to be in tPrimaryInfo, per database
+_processed_upload_watermark = {}
+_watermark_lock = threading.Lock()
+
+
+def get_latest_upload(database):
+    """Fetch the id, uploaded_id and created_on of the newest Conversation_ID_List entry with retries."""
     for attempt in range(max_retries):
         conn = get_connection(database)
         if conn is None:
-            return None, None  # Return None for both values if connection fails
+            return None, None, None  # Return None for all values if connection fails
 
         try:
-            query = """
-                SELECT uploaded_id, created_on FROM Conversation_ID_List 
-                WHERE id = (SELECT MAX(id) FROM Conversation_ID_List);
-            """
+            query = backend.select_top(1, "id, uploaded_id, created_on FROM Conversation_ID_List ORDER BY id DESC")
             cursor = conn.cursor()
             cursor.execute(query)
             row = cursor.fetchone()
-            return (row[0], row[1]) if row else (None, None)  # Return both values
+            return (row[0], row[1], row[2]) if row else (None, None, None)
         except Exception as e:
-            reportError(f"[ERROR] get_latest_uid failed (Attempt {attempt + 1}/3): {e}")
+            reportError(f"[ERROR] get_latest_upload failed (Attempt {attempt + 1}/{max_retries}): {e}")
             time.sleep(retry_delay)
         finally:
             if conn:
                 conn.close()
 
-    return None, None  # Return None for both values if all attempts fail
+    return None, None, None  # Return None for all values if all attempts fail
+
 
+def get_latest_uid(database):
+    """Fetch the latest uploaded_id and created_on timestamp from Conversation_ID_List with retries."""
+    _, uid, created_on = get_latest_upload(database)
+    return uid, created_on
+
+
+def is_uid_in_primaryinfo(database, uid):
+    """
+    Check whether tPrimaryInfo has any row for `uid`.
 
-def get_all_primaryinfo_uids(database):
-    """Fetch all distinct uploaded_id values from tPrimaryInfo."""
+    Probes a single row, an index seek on IX_tPrimaryInfo_uploaded_id (sql/mssql_indexes.sql for SQL Server,
+    sqlite_schema for the local stand-in).
+    """
     conn = get_connection(database)
     if conn is None:
-        return []
+        return False
     try:
-        query = "SELECT DISTINCT uploaded_id FROM tPrimaryInfo;"
         cursor = conn.cursor()
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        return [row[0] for row in rows]
+        cursor.execute(backend.select_top(1, "1 FROM tPrimaryInfo WHERE uploaded_id = ?"), (uid,))
+        return cursor.fetchone() is not None
     except Exception as e:
-        reportError(f"[ERROR] get_all_primaryinfo_uids: {e}")
-        print(f"[ERROR] get_all_primaryinfo_uids: {e}")
-        return []
+        reportError(f"[ERROR] is_uid_in_primaryinfo: {e}")
+        print(f"[ERROR] is_uid_in_primaryinfo: {e}")
+        return False
     finally:
         conn.close()
 
 
 def is_latest_uid_present(database):
-    """Check if the latest UID from Conversation_ID_List is already in tPrimaryInfo."""
-    latest_uid, created_on = get_latest_uid(database)
+    """
+    Check if the latest UID from Conversation_ID_List is already in tPrimaryInfo.
+
+    Returns (present, uid, created_on). Once an upload is confirmed present its id is kept as a watermark, so
+    polls without a new upload only run the single-row Conversation_ID_List query.
+    """
+    latest_id, latest_uid, created_on = get_latest_upload(database)
     if latest_uid is None:
-        return False, latest_uid
+        return False, latest_uid, created_on
+
+    with _watermark_lock:
+        watermark = _processed_upload_watermark.get(database)
+    if watermark is not None and latest_id <= watermark:
+        return True, latest_uid, created_on
+
+    present = is_uid_in_primaryinfo(database, latest_uid)
+    if present:
+        with _watermark_lock:
+            _processed_upload_watermark[database] = max(latest_id, _processed_upload_watermark.get(database, latest_id))
+    return present, latest_uid, created_on
+
+
+def get_unprocessed_uploads(lookback_hours=BRCP_BACKLOG_LOOKBACK_HOURS):
+    """
+    List the Conversation_ID_List uploads that have no rows in brcpData yet, all of them or only those of the last
+    `lookback_hours` (IST, like created_on).
+
+    Returns (uploaded_id, created_on) pairs, oldest first.
+    """
+    since_filter, params = ("WHERE created_on >= ?", (now_ist() - timedelta(hours=lookback_hours),)) \
+        if lookback_hours else ("", ())
+    conn = get_connection(INPUT_DATABASE)
+    if conn is None:
+        return []
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT uploaded_id, MIN(created_on) FROM Conversation_ID_List
+            {since_filter}
+            GROUP BY uploaded_id ORDER BY MIN(created_on);
+        """, params)
+        uploads = [(row[0], row[1]) for row in cursor.fetchall()]
+    except Exception as e:
+        reportError(f"[ERROR] get_unprocessed_uploads: {e}")
+        return []
+    finally:
+        conn.close()
+
+    if not uploads:
+        return []
+
+    # brcpData lives in the output database, so the processed check runs there against the candidate IDs
+    conn = get_connection(OUTPUT_DATABASE)
+    if conn is None:
+        return []
+    try:
+        with temp_id_table(conn, "upload_ids", "brcpData", "Uploaded_id", [uid for uid, _ in uploads]) as upload_ids:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT u.id FROM {upload_ids} u
+                WHERE EXISTS (SELECT 1 FROM brcpData b WHERE b.Uploaded_id = u.id);
+            """)
+            processed = {row[0] for row in cursor.fetchall()}
+    except Exception as e:
+        reportError(f"[ERROR] get_unprocessed_uploads: {e}")
+        return []
+    finally:
+        conn.close()
 
-    primaryinfo_uids = get_all_primaryinfo_uids(database)
-    return latest_uid in primaryinfo_uids, latest_uid, created_on
+    return [(uid, created_on) for uid, created_on in uploads if uid not in processed]
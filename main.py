@@ -1,19 +1,34 @@
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-import pandas as pd
 import pytz
 import requests
 from fastapi import FastAPI
 
 from ZulipMessenger import reportTranscriptGenerated, reportError, reportStatus
 from analyseData import analyse_data_using_gemini_for_brcp, analyse_data_for_soft_skill
-from fetchData import fetch_data_from_database, upload_cred_result_on_database, fetch_data_softskill, get_latest_uid, \
-    is_latest_uid_present, INPUT_DATABASE
+from fetchData import fetch_data_from_database, upload_cred_result_on_database, fetch_data_softskill, \
+    is_latest_uid_present, INPUT_DATABASE, get_pool_stats, get_unprocessed_uploads, is_uid_in_primaryinfo, \
+    NO_UNSCORED_CALLS, DB_BACKEND
+from resources.model import get_cache_stats, get_rate_limiter_stats, get_fake_llm_stats, get_embedding_cache_stats
+from resources.phrase_bank import preload_phrase_banks
+from resources.result_extractor_cleaner import get_parse_stats
 from resources.working_with_files import get_time
 
 app = FastAPI()
 
+# Encode (on first start) and memory-map the phrase embeddings once, before the first softskill run
+print("Phrase banks loaded:", preload_phrase_banks())
+
+# Number of uploads processed at the same time in backlog mode
+BRCP_BACKLOG_CONCURRENCY = int(os.getenv("BRCP_BACKLOG_CONCURRENCY", "2"))
+
+_uids_in_progress = set()
+_uids_in_progress_lock = threading.Lock()
+
 
 def fetch_api_result(uid: str, max_retries=100, retry_delay=5):
     """Fetch API result from external service with retry mechanism."""
@@ -59,7 +74,8 @@ def generate_output_brcp(uid, created_on):
     try:
         # Fetch data from the database
         df = fetch_data_from_database(uid)
-        time = get_time()
+        # The upload id keeps the Excel exports of concurrent backlog runs apart
+        time = f"{get_time()}_{uid}"
         if df is None or df.empty:
             error_msg = "Failed to fetch data from the database or DataFrame is empty."
             reportError(error_msg)
@@ -93,9 +109,83 @@ def home():
     return {"message": "CRED API Server is running!"}
 
 
+@app.get("/cache-stats")
+def cache_stats():
+    """Report how many Gemini calls and utterance embeddings were served from the on-disk caches."""
+    return {"gemini_response_cache": get_cache_stats(), "utterance_embedding_cache": get_embedding_cache_stats()}
+
+
+@app.get("/llm-stats")
+def llm_stats():
+    """Report the current client-side Gemini rate limit and parse failures; cache counters are on /cache-stats."""
+    return {"gemini_rate_limiter": get_rate_limiter_stats(), "gemini_parse_failures": get_parse_stats(),
+            "fake_llm": get_fake_llm_stats()}
+
+
+@app.get("/db-stats")
+def db_stats():
+    """Report the database backend and the connection pool statistics per database."""
+    return {"backend": DB_BACKEND, "connection_pools": get_pool_stats()}
+
+
+def process_upload(uid, created_on, transcripts_present=None):
+    """
+    Generate the transcripts of an upload if they are missing, then run the BRCP analysis on it.
+
+    `transcripts_present` is the result of an earlier tPrimaryInfo probe for `uid`; None probes again.
+    """
+    with _uids_in_progress_lock:
+        if uid in _uids_in_progress:
+            return {"status": "Skipped", "message": f"{uid} is already being processed"}
+        _uids_in_progress.add(uid)
+    try:
+        if transcripts_present is None:
+            transcripts_present = is_uid_in_primaryinfo(INPUT_DATABASE, uid)
+        transmon_response = fetch_api_result(uid) if not transcripts_present \
+            else {"status": "Success", "message": "Transcripts already present"}
+        gemini_response = generate_output_brcp(uid, created_on)
+        status = {"TransmonResponse": transmon_response, "GeminiResponse": gemini_response}
+        reportStatus(status)
+        return status
+    finally:
+        with _uids_in_progress_lock:
+            _uids_in_progress.discard(uid)
+
+
+def process_backlog():
+    """
+    Process every upload that is missing from brcpData (within BRCP_BACKLOG_LOOKBACK_HOURS if set), up to
+    BRCP_BACKLOG_CONCURRENCY at a time.
+    """
+    uploads = get_unprocessed_uploads()
+    if not uploads:
+        return {"status": "Success", "message": "NO new ID found"}
+
+    reportStatus(f"Backlog mode: processing {len(uploads)} uploads: {[uid for uid, _ in uploads]}")
+    # Every upload goes through the same process-wide Gemini rate limiter, so they share the quota
+    with ThreadPoolExecutor(max_workers=BRCP_BACKLOG_CONCURRENCY) as executor:
+        futures = {uid: executor.submit(process_upload, uid, created_on) for uid, created_on in uploads}
+        results = {}
+        for uid, future in futures.items():
+            try:
+                results[uid] = future.result()
+            except Exception as e:
+                reportError(f"Backlog processing of {uid} failed: {e}")
+                results[uid] = {"status": "Error", "message": str(e)}
+    return results
+
+
 @app.get("/brcp")
-def get_brcp_result():
-    """Fetch result from external API and process data using Gemini."""
+def get_brcp_result(backlog: bool = False):
+    """
+    Fetch result from external API and process data using Gemini.
+
+    With backlog=true every upload missing from brcpData is processed instead of only the latest one; the scheduler
+    (getBrcpOutput.py) always runs in this mode.
+    """
+    if backlog:
+        return process_backlog()
+
     status, uid, created_on = is_latest_uid_present(INPUT_DATABASE)
 
     if status:
@@ -107,10 +197,8 @@ def get_brcp_result():
         print(f"{uid} UID is NOT present in tPrimaryInfo.")
     # uid = "ETL_73059"
     if uid:
-        transmon_response = fetch_api_result(uid)
-        gemini_response = generate_output_brcp(uid, created_on)
-        status = {"TransmonResponse": transmon_response, "GeminiResponse": gemini_response}
-        reportStatus(status)
+        # is_latest_uid_present already found no transcripts for it
+        status = process_upload(uid, created_on, transcripts_present=False)
     else:
         status = {"status": "Fetching latest Upload ID Failed", "message": "Upload Id not found"}
         reportError(status)
@@ -121,12 +209,14 @@ def get_brcp_result():
 print("started")
 
 
-def generate_output_softskill(date: str):
+def generate_output_softskill(date: str, incremental=False):
     responseSoftSkill = {}
     try:
         # Fetch data
-        primaryInfo_df, transcript_df, transcriptChat_df, responseDB = fetch_data_softskill(date)
+        primaryInfo_df, transcript_df, transcriptChat_df, responseDB = fetch_data_softskill(date, incremental)
         responseSoftSkill['responseDB'] = responseDB
+        if responseDB == NO_UNSCORED_CALLS:
+            return responseSoftSkill
 
         # Function to check if a DataFrame is invalid
         def is_invalid_df(df):
@@ -149,12 +239,18 @@ def generate_output_softskill(date: str):
 
 
 @app.get("/softskill")
-def get_softskill_result():
+def get_softskill_result(date: str = None, incremental: bool = False):
+    """
+    Score the softskill parameters of the previous IST day, or of `date` (YYYY-MM-DD).
+
+    With incremental=true only calls without a softskill row are analysed, which allows intra-day runs
+    (e.g. hourly with today's date) and cheap re-runs after a failure.
+    """
     ist = pytz.timezone('Asia/Kolkata')
-    date = (datetime.now(ist) - timedelta(days=1)).date()
+    date = datetime.strptime(date, "%Y-%m-%d").date() if date else (datetime.now(ist) - timedelta(days=1)).date()
     print("req date in IST:", date)
-    reportStatus(f"Starting Softskill Parameter for {date}")
-    softskill_response = generate_output_softskill(date)
+    reportStatus(f"Starting Softskill Parameter for {date}{' (incremental)' if incremental else ''}")
+    softskill_response = generate_output_softskill(date, incremental)
     reportStatus(softskill_response)
 
     return {"database response": softskill_response}
@@ -1,5 +1,9 @@
+import os
+import random
 import re
 import time
+from collections import defaultdict
+from functools import partial
 
 import spacy
 import langid
@@ -8,130 +12,255 @@ import pandas as pd
 from rapidfuzz import process, fuzz
 
 from ZulipMessenger import reportError
-from sentence_transformers import util
-from resources.model import llm, timely_closing_ST_model
-from resources.phrases import phrases_to_mark_met, survey_phrases, feedback_phrases, disconnect_phrases_en, \
-    disconnect_phrases_hi, verbiage_phrases, hold_phrases, no_hold_phrases, duration_patterns, thank_you_phrases
-from resources.prompts import (RudeSarcastic_prompt, escalation_prompt, Supervisor_prompt, prompt_closing, \
-                               prompt_opening, Empathy_apology_prompt, reassurance_prompt,
-                               Unethical_Solicitation_prompt,
-                               voice_of_customer_prompt, prompt_opening_lang, timely_closing_prompt,
-                               prompt_Personalization, DSAT_prompt)
-from resources.result_extractor_cleaner import extract_json_objects, clean_text
+from resources.model import invoke_llm_batch, get_cache_stats, encode_normalized, new_embedding_store
+from resources.phrase_bank import load_phrase_bank
+from resources.phrases import phrases_to_mark_met, verbiage_phrases, hold_phrases, no_hold_phrases, duration_patterns, thank_you_phrases
+from resources.prompts import build_fused_prompt
+from resources.chunking import split_transcript, reduce_chunk_results
+from resources.classifier_specs import ClassifierSpec, ERROR_DUE_TO_LONG_CALL_TRANSCRIPT, CLASSIFIER_SPECS, \
+    FUSABLE_PARAMETERS, BRCP_FUSED_SECTIONS, RUDE_SARCASTIC_SPEC, ESCALATION_SPEC, SUPERVISOR_SPEC, \
+    APOLOGY_EMPATHY_SPEC, UNETHICAL_SOLICITATION_SPEC, REASSURANCE_SPEC, CHAT_CLOSING_SPEC, CHAT_OPENING_SPEC, \
+    DSAT_SPEC, VOICE_OF_CUSTOMER_SPEC, OPENING_LANG_SPEC, TIMELY_CLOSING_SPEC, PERSONALIZATION_SPEC, \
+    fused_response_schema
+from resources.result_extractor_cleaner import extract_json_objects, clean_text, split_fused_response, \
+    record_parse
 from resources.working_with_files import validateDataframes
 
-# Configure logging
-ERROR_DUE_TO_LONG_CALL_TRANSCRIPT = "500"
+# Transcripts longer than this are split at utterance boundaries and classified chunk by chunk
+LLM_MAX_TRANSCRIPT_CHARS = int(os.getenv("LLM_MAX_TRANSCRIPT_CHARS", "30000"))
+LLM_MIN_CHUNK_CHARS = 2000
 
+# Targeted retries of failed request IDs: attempt budget per ID and exponential backoff between rounds (seconds)
+LLM_RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "5"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
 
-def classify_rude_sarcastic(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
 
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
+def parse_first_json(response_text):
+    json_objects = extract_json_objects(response_text)
+    if not json_objects:
+        raise ValueError(f"No JSON object found in Gemini response: {str(response_text)[:200]}")
+    return json_objects[0]
 
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{RudeSarcastic_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Sarcasm_rude_behaviour': clean_text(extracted.get('Sarcasm_rude_behaviour', 'N/A')),
-                'Sarcasm_rude_behaviour_evidence': clean_text(extracted.get('Sarcasm_rude_behaviour_evidence', 'N/A'))
-            })
-        except Exception as e:
-            errors.append(request_id)
-            results.append({'request_id': request_id, 'Sarcasm_rude_behaviour': "Error",
-                            'Sarcasm_rude_behaviour_evidence': str(e)})
 
-    return pd.DataFrame(results), errors
+def classify_transcripts(rows, prompt, reducers=None, parse_response=parse_first_json, response_schema=None,
+                         name=None):
+    """
+    Classify the transcript of every row and return the parsed JSON (or the exception) per row, in order.
 
+    Long transcripts are split into chunks at their line (utterance) boundaries, all chunks are sent concurrently and
+    the per-chunk answers are merged with `reducers`. A transcript that Gemini rejects with a 500 is split in half
+    once more instead of being retried whole. Parse outcomes are counted under `name`.
+    """
+    results = [None] * len(rows)
+    max_chars = [LLM_MAX_TRANSCRIPT_CHARS] * len(rows)
+    pending = list(range(len(rows)))
+
+    for attempt in range(2):
+        chunk_owners, chunk_texts = [], []
+        for i in pending:
+            chunks = split_transcript(rows[i].get("transcript", ""), max_chars[i])
+            chunk_owners.extend([i] * len(chunks))
+            chunk_texts.extend(chunks)
+
+        # parse_response also decides which answers may be cached, so a broken answer is never served to a retry
+        responses = invoke_llm_batch(chunk_texts, prompt, response_schema=response_schema, validate=parse_response)
+        chunk_responses = defaultdict(list)
+        for i, response in zip(chunk_owners, responses):
+            chunk_responses[i].append(response)
+
+        retry = []
+        for i in pending:
+            error = next((response for response in chunk_responses[i] if isinstance(response, Exception)), None)
+            if error is None:
+                try:
+                    parsed = [parse_response(response) for response in chunk_responses[i]]
+                    results[i] = parsed[0] if len(parsed) == 1 else reduce_chunk_results(parsed, reducers)
+                    record_parse(name or "unnamed", True)
+                except Exception as e:
+                    record_parse(name or "unnamed", False)
+                    results[i] = e
+                continue
 
-def process_transcripts_escalation(df: pd.DataFrame, request_ids=None):
+            results[i] = error
+            transcript_length = len(str(rows[i].get("transcript", "")))
+            if attempt == 0 and ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in str(error) \
+                    and transcript_length > 2 * LLM_MIN_CHUNK_CHARS:
+                max_chars[i] = max(LLM_MIN_CHUNK_CHARS, min(max_chars[i], transcript_length) // 2)
+                retry.append(i)
+
+        pending = retry
+        if not pending:
+            break
+
+    return results
+
+
+def run_classifier(spec: ClassifierSpec, df: pd.DataFrame, request_ids=None):
+    """
+    Classify every transcript of `df` (or only `request_ids`) for one parameter.
+
+    Returns the result DataFrame with one row per transcript and the list of request IDs that failed.
+    """
     results, errors = [], []
     request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
 
-    for row in df.to_dict('records'):
+    rows = [row for row in df.to_dict('records') if row.get("request_id") in request_id_list]
+    extracted_results = classify_transcripts(rows, spec.prompt, spec.reducers,
+                                             response_schema=spec.response_schema(), name=spec.name)
+
+    for row, extracted in zip(rows, extracted_results):
         request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
+        result = {'request_id': request_id}
+        if spec.keep_transcript:
+            result['transcript'] = row.get("transcript", "")
 
         try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{escalation_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'escalation_results': clean_text(extracted.get('Value', 'N/A')),
-                'Issue_Identification': clean_text(extracted.get('Issue', 'N/A')),
-                'Probable_Reason_for_Escalation': clean_text(extracted.get('Reason', 'N/A')),
-                'Probable_Reason_for_Escalation_Evidence': clean_text(extracted.get('Evidence', 'N/A')),
-                'Agent_Handling_Capability': clean_text(extracted.get('Agent Handling Capability', 'N/A'))
-            })
+            if isinstance(extracted, Exception):
+                raise extracted
+            result.update(spec.result_row(extracted))
         except Exception as e:
             errors.append(request_id)
-            results.append({
-                'request_id': request_id,
-                'escalation_results': "Error",
-                'Issue_Identification': str(e),
-                'Probable_Reason_for_Escalation': str(e),
-                'Probable_Reason_for_Escalation_Evidence': str(e),
-                'Agent_Handling_Capability': str(e)
-            })
+            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT not in str(e):
+                print(f"Error processing request_id {request_id}: {e}")
+            result.update(spec.failure_row(e))
+        results.append(result)
 
     return pd.DataFrame(results), errors
 
 
+def classify_rude_sarcastic(df: pd.DataFrame, request_ids=None):
+    return run_classifier(RUDE_SARCASTIC_SPEC, df, request_ids)
+
+
+def process_transcripts_escalation(df: pd.DataFrame, request_ids=None):
+    return run_classifier(ESCALATION_SPEC, df, request_ids)
+
+
 def classify_supervisor(df: pd.DataFrame, request_ids=None):
+    return run_classifier(SUPERVISOR_SPEC, df, request_ids)
+
+
+def classifyApologyEmpathy(df: pd.DataFrame, request_ids=None):
+    return run_classifier(APOLOGY_EMPATHY_SPEC, df, request_ids)
+
+
+def classifyUnethicalSolicitation(df: pd.DataFrame, request_ids=None):
+    return run_classifier(UNETHICAL_SOLICITATION_SPEC, df, request_ids)
+
+
+def classifyReassurance(df: pd.DataFrame, request_ids=None):
+    return run_classifier(REASSURANCE_SPEC, df, request_ids)
+
+
+def classifyChatClosing(df: pd.DataFrame, request_ids=None):
+    return run_classifier(CHAT_CLOSING_SPEC, df, request_ids)
+
+
+def classifyChatOpening(df: pd.DataFrame, request_ids=None):
+    return run_classifier(CHAT_OPENING_SPEC, df, request_ids)
+
+
+def classify_DSAT(df: pd.DataFrame, request_ids=None):
+    return run_classifier(DSAT_SPEC, df, request_ids)
+
+
+def classifyVoiceOfCustomer(df: pd.DataFrame, request_ids=None):
+    return run_classifier(VOICE_OF_CUSTOMER_SPEC, df, request_ids)
+
+
+def classifyOpeningLang(df: pd.DataFrame, request_ids=None):
+    return run_classifier(OPENING_LANG_SPEC, df, request_ids)
+
+
+def classifyTimelyClosing(df: pd.DataFrame, request_ids=None):
+    return run_classifier(TIMELY_CLOSING_SPEC, df, request_ids)
+
+
+def classifyPersonalization(df: pd.DataFrame, request_ids=None):
+    return run_classifier(PERSONALIZATION_SPEC, df, request_ids)
+
+
+def classify_fused(df: pd.DataFrame, section_names, request_ids=None):
+    """
+    Classify several parameters with a single Gemini call per transcript.
+
+    The combined answer is split back into the same columns the individual classifiers produce.
+    """
     results, errors = [], []
     request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
+    specs = [CLASSIFIER_SPECS[name] for name in section_names]
+    fused_prompt = build_fused_prompt([(spec.name, spec.prompt) for spec in specs])
 
-    for row in df.to_dict('records'):
+    rows = [row for row in df.to_dict('records') if row.get("request_id") in request_id_list]
+    section_results = classify_transcripts(
+        rows, fused_prompt, reducers={spec.name: spec.reducers for spec in specs},
+        parse_response=lambda text: split_fused_response(extract_json_objects(text), section_names),
+        response_schema=fused_response_schema(specs),
+        name="+".join(section_names))
+
+    for row, sections in zip(rows, section_results):
         request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
+        result = {'request_id': request_id}
 
         try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{Supervisor_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Wanted_to_connect_with_supervisor': clean_text(extracted.get('Wanted_to_connect_with_supervisor',
-                                                                              'N/A')),
-                'de_escalate': clean_text(extracted.get('de_escalate', 'N/A')),
-                'Supervisor_call_connected': clean_text(extracted.get('Supervisor_call_connected', 'N/A')),
-                'call_back_arranged_from_supervisor': clean_text(extracted.get('call_back_arranged_from_supervisor',
-                                                                               'N/A')),
-                'supervisor_evidence': clean_text(extracted.get('supervisor_evidence', 'N/A')),
-                'Denied_for_Supervisor_call': clean_text(extracted.get('Denied_for_Supervisor_call', 'N/A')),
-                'denied_evidence': clean_text(extracted.get('denied_evidence', 'N/A'))
-            })
+            if isinstance(sections, Exception):
+                raise sections
+            for spec in specs:
+                result.update(spec.result_row(sections[spec.name]))
         except Exception as e:
             errors.append(request_id)
-            results.append({
-                'request_id': request_id,
-                'Wanted_to_connect_with_supervisor': "Error",
-                'de_escalate': str(e),
-                'Supervisor_call_connected': str(e),
-                'call_back_arranged_from_supervisor': str(e),
-                'supervisor_evidence': str(e),
-                'Denied_for_Supervisor_call': str(e),
-                'denied_evidence': str(e)
-            })
+            print(f"Error processing request_id {request_id}: {e}")
+            for spec in specs:
+                result.update(spec.failure_row(e))
+        results.append(result)
 
     return pd.DataFrame(results), errors
 
 
-def retry_classification(main_df, parameter_df, classify_func, error_ids, columns, max_retries=20):
+def classify_brcp_fused(df: pd.DataFrame, request_ids=None):
+    return classify_fused(df, BRCP_FUSED_SECTIONS, request_ids)
+
+
+def parse_fused_groups(group_layout):
+    """
+    Parse a fused group layout such as "ApologyEmpathy,Reassurance;ChatOpening,ChatClosing".
+
+    Groups are separated by ";" and the parameters of a group by ",". Unknown parameter names are skipped.
+    """
+    groups = []
+    for group in group_layout.split(";"):
+        names = [name.strip() for name in group.split(",") if name.strip()]
+        unknown = [name for name in names if name not in FUSABLE_PARAMETERS]
+        if unknown:
+            print(f"⚠️ Ignoring unknown fused parameters: {unknown}")
+        names = [name for name in names if name in FUSABLE_PARAMETERS]
+        if names:
+            groups.append(names)
+    return groups
+
+
+def process_fused_classification(df, groups):
     """
-    Retries classification for failed request IDs up to a maximum of 20 times.
+    Classify every fused group with process_classification and split the results per parameter.
+
+    Returns a dict of parameter name -> DataFrame with the same columns as the individual classifier.
+    """
+    parameter_dfs = {}
+    for group in groups:
+        group_columns = [column for name in group for column in CLASSIFIER_SPECS[name].columns]
+        group_res_df = process_classification(partial(classify_fused, section_names=group), df, group_columns,
+                                              f"Fused {', '.join(group)}")
+        for name in group:
+            columns = ['request_id'] + list(CLASSIFIER_SPECS[name].columns)
+            parameter_dfs[name] = group_res_df[columns].copy() if group_res_df is not None else None
+    return parameter_dfs
+
+
+def retry_classification(main_df, parameter_df, classify_func, error_ids, columns, max_retries=LLM_RETRY_MAX_ATTEMPTS,
+                         name=None):
+    """
+    Retries classification for failed request IDs only, with exponential backoff and jitter between rounds.
 
     Args:
         main_df (DataFrame): Original dataframe.
@@ -139,36 +268,54 @@ def retry_classification(main_df, parameter_df, classify_func, error_ids, column
         classify_func (function): Function used to classify the parameter.
         error_ids (list): List of request IDs that failed classification.
         columns (list): Expected columns in the classification result.
-        max_retries (int): Maximum number of retry attempts (default: 20).
+        max_retries (int): Maximum number of retry attempts per request ID.
+        name (str): Parameter name used in the error report, defaults to the function name.
 
     Returns:
         DataFrame: Updated parameter_df with retried values.
     """
-    attempt = 0
-    initial_error_ids = set(error_ids)  # Store initial error IDs for final reporting
-
-    while error_ids and attempt < max_retries:
-        attempt += 1
-        rerun_res_df, new_error_ids = classify_func(main_df, request_ids=error_ids)
-
+    attempts = dict.fromkeys(error_ids, 0)
+    # Only the failed transcripts are handed to the classifier again, not the whole frame
+    pending_df = main_df[main_df['request_id'].isin(attempts)]
+    retried_frames = []
+    retry_round = 0
+
+    while True:
+        pending_ids = [request_id for request_id, count in attempts.items() if count < max_retries]
+        if not pending_ids:
+            break
+
+        if retry_round:
+            # Back off between rounds; the first retry runs straight away
+            delay = min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** (retry_round - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+        retry_round += 1
+
+        rerun_res_df, new_error_ids = classify_func(pending_df[pending_df['request_id'].isin(pending_ids)],
+                                                    request_ids=pending_ids)
         if not rerun_res_df.empty:
-            # Update only failed request IDs in the existing dataframe
-            for row in rerun_res_df.to_dict('records'):
-                request_id = row['request_id']
-                if request_id in parameter_df['request_id'].values:
-                    row_series = pd.Series(row)  # Convert row to Pandas Series
-                    parameter_df.loc[parameter_df['request_id'] == request_id, columns] = row_series[columns].values
+            retried_frames.append(rerun_res_df)
 
-        error_ids = new_error_ids  # Update remaining error IDs
-
-        if not new_error_ids:
-            return parameter_df  # Exit early if all errors are resolved
-
-    # Report errors **only after 20 attempts are done**
-    if error_ids:
-        failed_ids = ", ".join(map(str, error_ids))
-        reportError(f"❌ {classify_func} failed after {max_retries} attempts for {len(error_ids)} request IDs. "
-                    f"Failed IDs: {failed_ids}")
+        failed = set(new_error_ids)
+        for request_id in pending_ids:
+            if request_id in failed:
+                attempts[request_id] += 1
+            else:
+                del attempts[request_id]
+
+    if retried_frames:
+        # Last answer per request ID wins, written back by index alignment in one pass per column
+        updates = pd.concat(retried_frames).drop_duplicates('request_id', keep='last').set_index('request_id')
+        mask = parameter_df['request_id'].isin(updates.index)
+        for column in columns:
+            if column in updates.columns:
+                parameter_df.loc[mask, column] = parameter_df.loc[mask, 'request_id'].map(updates[column])
+
+    # Report errors only once the attempt budget of every request ID is spent
+    if attempts:
+        failed_ids = ", ".join(map(str, attempts))
+        reportError(f"❌ {name or getattr(classify_func, '__name__', 'classification')} failed after {max_retries} attempts "
+                    f"for {len(attempts)} request IDs. Failed IDs: {failed_ids}")
 
     return parameter_df
 
@@ -263,307 +410,6 @@ def classify_langSwitch(transcriptChat_df):
     return lang_switch_df
 
 
-def classifyApologyEmpathy(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{Empathy_apology_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Apology_result': clean_text(extracted.get('Apology', 'N/A')),
-                'Apology_evidence': clean_text(extracted.get('Apology Evidence', 'N/A')),
-                'Empathy_result': clean_text(extracted.get('Empathy', 'N/A')),
-                'Empathy_evidence': clean_text(extracted.get('Empathy Evidence', 'N/A')),
-                'Apology_Category': clean_text(extracted.get('Apology Category', 'N/A')),
-                'Empathy_Category': clean_text(extracted.get('Empathy Category', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Apology_result': "Error 500",
-                    'Apology_evidence': "An unexpected error occurred on Google's side. Your input context is too long.",
-                    'Empathy_result': "Error 500",
-                    'Empathy_evidence': "An unexpected error occurred on Google's side. Your input context is too long.",
-                    'Apology_Category': "Error 500",
-                    'Empathy_Category': "An unexpected error occurred on Google's side. Your input context is too long."
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Apology_result': "Error",
-                    'Apology_evidence': str(e),
-                    'Empathy_result': "Error",
-                    'Empathy_evidence': str(e),
-                    'Apology_Category': "Error",
-                    'Empathy_Category': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyUnethicalSolicitation(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{Unethical_Solicitation_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Unethical_Solicitation': clean_text(extracted.get('Unethical_Solicitation', 'N/A')),
-                'Unethical_Solicitation_Evidence': clean_text(extracted.get('Unethical_Solicitation_Evidence', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Unethical_Solicitation': "Error 500",
-                    'Unethical_Solicitation_Evidence': "An unexpected error occurred on the server side.",
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Unethical_Solicitation': "Error",
-                    'Unethical_Solicitation_Evidence': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyReassurance(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{reassurance_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Reassurance_result': clean_text(extracted.get('Value', 'N/A')),
-                'Reassurance_evidence': clean_text(extracted.get('Evidence', 'N/A')),
-                'Reassurance_Category': clean_text(extracted.get('Category', 'N/A'))
-
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Reassurance_result': "Error 500",
-                    'Reassurance_evidence': "An unexpected error occurred on the server side.",
-                    'Reassurance_Category': str(e)
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Reassurance_result': "Error",
-                    'Reassurance_evidence': str(e),
-                    'Reassurance_Category': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyChatClosing(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{prompt_closing}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Further Assistance': clean_text(extracted.get('Further Assistance', 'N/A')),
-                'Further Assistance Evidence': clean_text(extracted.get('Further Assistance Evidence', 'N/A')),
-                'Effective IVR Survey': clean_text(extracted.get('Effective IVR Survey', 'N/A')),
-                'Effective IVR Survey Evidence': clean_text(extracted.get('Effective IVR Survey Evidence', 'N/A')),
-                'Branding': clean_text(extracted.get('Branding', 'N/A')),
-                'Branding Evidence': clean_text(extracted.get('Branding Evidence', 'N/A')),
-                'Greeting': clean_text(extracted.get('Greeting', 'N/A')),
-                'Greeting Evidence': clean_text(extracted.get('Greeting Evidence', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Further Assistance Evidence': "An unexpected error occurred on Google's side. Your input context "
-                                                   "is too long.",
-                    'Effective IVR Survey': "Error 500",
-                    'Effective IVR Survey Evidence': "An unexpected error occurred on Google's side. Your input "
-                                                     "context is too long.",
-                    'Branding': "Error 500",
-                    'Branding Evidence': "An unexpected error occurred on Google's side. Your input context is too "
-                                         "long.",
-                    'Greeting': "Error 500",
-                    'Greeting Evidence': "An unexpected error occurred on Google's side. Your input context is too "
-                                         "long."
-
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Further Assistance': "Error",
-                    'Further Assistance Evidence': str(e),
-                    'Effective IVR Survey': "Error",
-                    'Effective IVR Survey Evidence': str(e),
-                    'Branding': "Error",
-                    'Branding Evidence': str(e),
-                    'Greeting': "Error",
-                    'Greeting Evidence': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyChatOpening(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{prompt_opening}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Greeting_the_customer': clean_text(extracted.get('Greeting the Customer', 'N/A')),
-                'Greeting_the_customer_evidence': clean_text(extracted.get('Greeting the Customer Evidence', 'N/A')),
-                'Self_introduction': clean_text(extracted.get('Self Introduction', 'N/A')),
-                'Self_introduction_evidence': clean_text(extracted.get('Self Introduction Evidence', 'N/A')),
-                'Identity_confirmation': clean_text(extracted.get('Customer Identity Confirmation', 'N/A')),
-                'Identity_confirmation_evidence': clean_text(
-                    extracted.get('Customer Identity Confirmation Evidence', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Further Assistance Evidence': "An unexpected error occurred on Google's side. Your input context "
-                                                   "is too long.",
-                    'Effective IVR Survey': "Error 500",
-                    'Effective IVR Survey Evidence': "An unexpected error occurred on Google's side. Your input "
-                                                     "context is too long.",
-                    'Branding': "Error 500",
-                    'Branding Evidence': "An unexpected error occurred on Google's side. Your input context is too "
-                                         "long.",
-                    'Greeting': "Error 500",
-                    'Greeting Evidence': "An unexpected error occurred on Google's side. Your input context is too "
-                                         "long."
-
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Further Assistance': "Error",
-                    'Further Assistance Evidence': str(e),
-                    'Effective IVR Survey': "Error",
-                    'Effective IVR Survey Evidence': str(e),
-                    'Branding': "Error",
-                    'Branding Evidence': str(e),
-                    'Greeting': "Error",
-                    'Greeting Evidence': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classify_DSAT(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{DSAT_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Customer_Issue_Identification': clean_text(extracted.get('Customer_Issue_Identification', 'N/A')),
-                'Reason_for_DSAT': clean_text(extracted.get('Reason_for_DSAT', 'N/A')),
-                'Suggestion_for_DSAT_Prevention': clean_text(extracted.get('Suggestion_for_DSAT_Prevention', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Customer_Issue_Identification': "Error 500",
-                    'Reason_for_DSAT': "Error",
-                    'Suggestion_for_DSAT_Prevention': str(e)})
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Customer_Issue_Identification': "Error",
-                    'Reason_for_DSAT': "Error",
-                    'Suggestion_for_DSAT_Prevention': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
 def create_final_DSAT_results(df, DSAT_res_df, Survey_IDS):
     final_DSAT_res_df = pd.DataFrame({'request_id': df['request_id']})
     final_DSAT_res_df['DSAT_result'] = final_DSAT_res_df['request_id'].apply(
@@ -576,135 +422,6 @@ def create_final_DSAT_results(df, DSAT_res_df, Survey_IDS):
     return final_DSAT_res_df
 
 
-def classifyVoiceOfCustomer(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{voice_of_customer_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'VOC_Category': clean_text(extracted.get('Category', 'N/A')),
-                'VOC_Core_Issue_Summary': clean_text(extracted.get('Core_Issue_Summary', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'VOC_Category': "Error 500",
-                    'VOC_Core_Issue_Summary': "An unexpected error occurred on Google's side. Your input context is too long."
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'VOC_Category': "Error",
-                    'VOC_Core_Issue_Summary': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyOpeningLang(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{prompt_opening_lang}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Open the call in default language': clean_text(extracted.get('default_opening_lang', 'N/A')),
-                'Open the call in default language evidence': clean_text(extracted.get('Evidence', 'N/A')),
-                'Open the call in default language Reason': clean_text(extracted.get('Reason', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Open the call in default language': "Error 500",
-                    'Open the call in default language evidence': str(error_message),
-                    'Open the call in default language Reason': "Error"
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Open the call in default language': "Error",
-                    'Open the call in default language evidence': str(error_message),
-                    'Open the call in default language evidence Reason': "Error"
-                })
-
-    return pd.DataFrame(results), errors
-
-
-def classifyTimelyClosing(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{timely_closing_prompt}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'transcript': transcript,
-                'Category': clean_text(extracted.get('Category', 'N/A')),
-                'Summary': clean_text(extracted.get('Summary', 'N/A')),
-                'Supporting_Evidence': clean_text(extracted.get('Supporting_Evidence', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'transcript': transcript,
-                    'Category': "Error",
-                    'Summary': "Server Error",
-                    'Supporting_Evidence': "Error"
-                })
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'transcript': transcript,
-                    'Category': "Error",
-                    'Summary': str(e),
-                    'Supporting_Evidence': "Error"
-                })
-
-    return pd.DataFrame(results), errors
-
-
 def evaluate_verbiage(time_diff, threshold):
     if isinstance(time_diff, (int, float)):
         return 'Met' if time_diff <= threshold else 'Not Met'
@@ -720,6 +437,36 @@ def evaluate_timely_closing(r):
         return 'Not Met'
 
 
+def match_sentences_to_phrases(texts, phrase_banks, threshold=0.7, embed=encode_normalized):
+    """
+    For each text, whether any of its ". "-separated sentences has a cosine similarity above `threshold` with any
+    phrase of each bank (name -> normalized phrase embeddings).
+
+    The sentences of all texts are embedded with one `embed` call (encode_normalized or an EmbeddingStore's
+    get_many) and scored against every bank with a single similarity matrix. Returns name -> boolean array, in the
+    order of `texts`.
+    """
+    sentences, sentence_counts = [], []
+    for text in texts:
+        text_sentences = text.split(". ")
+        sentences.extend(text_sentences)
+        sentence_counts.append(len(text_sentences))
+    if not sentences:
+        return {name: np.zeros(0, dtype=bool) for name in phrase_banks}
+
+    names = list(phrase_banks)
+    bank_ends = np.cumsum([len(phrase_banks[name]) for name in names])
+    similarities = embed(sentences) @ np.concatenate([phrase_banks[name] for name in names]).T
+
+    # str.split always yields at least one sentence, so every text owns a non-empty run of rows
+    text_starts = np.concatenate([[0], np.cumsum(sentence_counts)[:-1]])
+    matches = {}
+    for name, start, end in zip(names, np.r_[0, bank_ends[:-1]], bank_ends):
+        best_per_sentence = similarities[:, start:end].max(axis=1)
+        matches[name] = np.maximum.reduceat(best_per_sentence, text_starts) > threshold
+    return matches
+
+
 #Timely Closing Parameter
 def processing_timely_closing(timely_closing_primary_info, timely_closing_transcript, timely_closing_transcript_chat,
                               timely_closing_survey_column_name):
@@ -743,43 +490,22 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
         call_ended_abruptly_ids = [str(call_ended_abruptly_id) for call_ended_abruptly_id in call_ended_abruptly_ids]
         timely_closing_transcript_new = timely_closing_transcript[
             timely_closing_transcript['request_id'].isin(call_ended_abruptly_ids)]
-        # Encode the phrases
-        survey_embeddings = timely_closing_ST_model.encode(survey_phrases, convert_to_tensor=True)
-        feedback_embeddings = timely_closing_ST_model.encode(feedback_phrases, convert_to_tensor=True)
-
-        # Function to find matching phrases based on cosine similarity
-        def find_matching_phrases(text, phrase_embeddings, threshold=0.7):
-            text_sentences = text.split(". ")
-            text_embeddings = timely_closing_ST_model.encode(text_sentences, convert_to_tensor=True)
-            matching_phrases = False
-            for sentence_embedding in text_embeddings:
-                # Compute cosine similarity between the sentence and all phrases
-                similarities = util.pytorch_cos_sim(sentence_embedding, phrase_embeddings)
-                # Get the maximum similarity score for this sentence
-                max_similarity = similarities.max().item()
-                if max_similarity > threshold:
-                    matching_phrases = True
-                    break
-            return matching_phrases
-
-        # Evaluate each transcript and update DataFrame
-        def evaluate_transcripts(transcript_df, survey_phrase_embeddings, feedback_phrase_embeddings):
-            results = []
-            for trans_idx, r in transcript_df.iterrows():
-                text = r['transcript']
-                has_feedback = find_matching_phrases(text, feedback_phrase_embeddings)
-                has_survey = find_matching_phrases(text, survey_phrase_embeddings)
-                print("Survey or feedback phrase found for request Id: " + r['request_id'])
-                results.append({
-                    'request_id': r['request_id'],
-                    'has_feedback_phrase': has_feedback,
-                    'has_survey_phrase': has_survey
-                })
-            return pd.DataFrame(results)
-
-        # Process the transcripts
-        processed_transcripts = evaluate_transcripts(timely_closing_transcript_new, survey_embeddings,
-                                                     feedback_embeddings)
+        # Precomputed phrase embeddings, see resources/phrase_bank.py
+        survey_embeddings = load_phrase_bank('survey')
+        feedback_embeddings = load_phrase_bank('feedback')
+        # Every text of this run is encoded once and shared by all the checks below
+        embeddings = new_embedding_store()
+
+        # Score every sentence of every transcript against both phrase banks at once
+        matches = match_sentences_to_phrases(timely_closing_transcript_new['transcript'].tolist(),
+                                             {'feedback': feedback_embeddings, 'survey': survey_embeddings},
+                                             embed=embeddings.get_many)
+        processed_transcripts = pd.DataFrame({
+            'request_id': timely_closing_transcript_new['request_id'].tolist(),
+            'has_feedback_phrase': matches['feedback'].tolist(),
+            'has_survey_phrase': matches['survey'].tolist()
+        })
+        print(f"Survey and feedback phrases checked for {len(processed_transcripts)} calls")
         # Merge with the original transcript DataFrame
         timely_closing_transcript_new = timely_closing_transcript_new.merge(processed_transcripts, on='request_id',
                                                                             how='left')
@@ -807,17 +533,16 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
             timely_closing_columns = ['Category', 'Summary', 'Supporting_Evidence']
             timely_closing_res_df = retry_classification(final_transcript_df, timely_closing_res_df,
                                                          classifyTimelyClosing,
-                                                         timely_closing_error_ids, timely_closing_columns)
+                                                         timely_closing_error_ids, timely_closing_columns,
+                                                         name="Timely Closing")
 
-        # Define the phrases to check against
-        reference_phrases = ['The customer agreed to give feedback', 'Incomplete feedback request', ' [N/A]']
-        reference_embeddings = timely_closing_ST_model.encode(reference_phrases, convert_to_tensor=True)
+        # Embeddings of the phrases to check against (timely_closing_reference_phrases)
+        reference_embeddings = load_phrase_bank('timely_closing_reference')
 
         # Function to check if the category matches any reference phrase with a threshold of 0.9
         def matches_reference_category(category):
-            category_embedding = timely_closing_ST_model.encode(category)
-            cosine_scores = util.pytorch_cos_sim(category_embedding, reference_embeddings)
-            return cosine_scores.max().item() > 0.9  # Using threshold of 0.9
+            cosine_scores = reference_embeddings @ embeddings.get(category)
+            return cosine_scores.max() > 0.9  # Using threshold of 0.9
 
         if timely_closing_res_df.empty:
             print("Data went Empty no category matched!!!")
@@ -849,20 +574,21 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                 print("There are some IDs where customer declined to give feedback!!!")
                 timely_closing_transcript_chat = timely_closing_transcript_chat[
                     timely_closing_transcript_chat['request_id'].isin(final_transcript_ids)]
+                # Encode the utterances of these calls in one batch; the checks below only read them from the store
+                embeddings.get_many(timely_closing_transcript_chat['transcript'].tolist())
 
                 # Define function to check for evidence phrase in transcript
                 def check_phrases_in_transcript(trans_rows, evidence_start_times, evidence_transcript, threshold=0.8):
-                    evidence_embedding = timely_closing_ST_model.encode(evidence_transcript, convert_to_tensor=True)
-                    for r in range(len(trans_rows)):
-                        # Encode each transcript row
-                        transcript_embedding = timely_closing_ST_model.encode(trans_rows[r], convert_to_tensor=True)
-                        # Compute cosine similarity
-                        similarity = util.pytorch_cos_sim(evidence_embedding, transcript_embedding)
-                        if similarity.item() >= threshold:
-                            return {
-                                'matched_string': trans_rows[r],
-                                'starttime': evidence_start_times[r]
-                            }
+                    evidence_embedding = embeddings.get(evidence_transcript)
+                    # Cosine similarity of every transcript row, the first row over the threshold wins
+                    similarities = embeddings.get_many(trans_rows) @ evidence_embedding
+                    matching_rows = np.flatnonzero(similarities >= threshold)
+                    if len(matching_rows):
+                        r = matching_rows[0]
+                        return {
+                            'matched_string': trans_rows[r],
+                            'starttime': evidence_start_times[r]
+                        }
                     return None
 
                 # Initialize new columns in DataModelling_res_df
@@ -892,16 +618,13 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                             print(f"ID {request_id}: Transcript rows are empty.")
                     else:
                         print(f"ID {request_id}: Missing required columns in transcript data.")
-                # Encode disconnect phrases
-                embedding_disconnect_en = [timely_closing_ST_model.encode(phrase, convert_to_tensor=True) for phrase in
-                                           disconnect_phrases_en]
-                embedding_disconnect_hi = [timely_closing_ST_model.encode(phrase, convert_to_tensor=True) for phrase in
-                                           disconnect_phrases_hi]
+                # Precomputed disconnect phrase embeddings
+                embedding_disconnect_en = load_phrase_bank('disconnect_en')
+                embedding_disconnect_hi = load_phrase_bank('disconnect_hi')
                 print("Fetching details when agent asked the customer to disconnect the call...")
 
                 def check_disconnect_phrases(trans_rows, disconnect_time, embedding_disconnect_en_phrase,
-                                             embedding_disconnect_hi_phrase, model,
-                                             disconnect_start_time, threshold=0.5):
+                                             embedding_disconnect_hi_phrase, disconnect_start_time, threshold=0.5):
                     if disconnect_start_time is None:
                         print("Start time is None. Skipping check.")
                         return {'found': False, 'time': None}
@@ -910,17 +633,11 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                         combined_start_time = disconnect_time[tr] if tr < len(disconnect_time) else None
                         if combined_start_time is not None and combined_start_time > disconnect_start_time:  # Ensure we check
                             # after the given start time
-                            embedding_text = model.encode(combined_text, convert_to_tensor=True)
-                            # Check against English phrases
-                            for embedding_disconnect in embedding_disconnect_en_phrase:
-                                similarity = util.pytorch_cos_sim(embedding_text, embedding_disconnect)
-                                if similarity.item() >= threshold:
-                                    return {'found': f'{combined_text}', 'time': combined_start_time}
-                            # Check against Hindi phrases
-                            for embedding_disconnect in embedding_disconnect_hi_phrase:
-                                similarity = util.pytorch_cos_sim(embedding_text, embedding_disconnect)
-                                if similarity.item() >= threshold:
-                                    return {'found': f'{combined_text}', 'time': combined_start_time}
+                            embedding_text = embeddings.get(combined_text)
+                            # Check against English phrases, then Hindi phrases
+                            if (embedding_disconnect_en_phrase @ embedding_text).max() >= threshold or \
+                                    (embedding_disconnect_hi_phrase @ embedding_text).max() >= threshold:
+                                return {'found': f'{combined_text}', 'time': combined_start_time}
                     return {'found': None, 'time': None}
 
                 # Initialize new columns for disconnect phrase detection
@@ -940,8 +657,7 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                         if transcript_rows:
                             # Check for disconnect phrases after the given start time
                             result = check_disconnect_phrases(transcript_rows, start_times, embedding_disconnect_en,
-                                                              embedding_disconnect_hi, timely_closing_ST_model,
-                                                              starttime)
+                                                              embedding_disconnect_hi, starttime)
                             if result['found']:
                                 timely_closing_res_df.at[index, 'disconnect_phrase_found'] = result['found']
                                 timely_closing_res_df.at[index, 'disconnect_time'] = result['time']
@@ -1001,22 +717,37 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                         timely_closing_res_df.loc[:, f'disconnection_verbiage_{i}'] = pd.NA
                         timely_closing_res_df.loc[:, f'disconnection_verbiage_{i}_time'] = pd.NA
 
-                    # Function to calculate semantic similarity using the transformer model
-
-                    def is_similar(phrase, transcript_phrase, threshold=0.7):
-                        # Encode both phrases
-                        embeddings1 = timely_closing_ST_model.encode(phrase, convert_to_tensor=True)
-                        embeddings2 = timely_closing_ST_model.encode(transcript_phrase, convert_to_tensor=True)
-                        # Calculate cosine similarity
-                        cosine_scores = util.pytorch_cos_sim(embeddings1, embeddings2)
-                        # Return True if similarity score is greater than the threshold
-                        return cosine_scores.item() > threshold
+                    # Similarity of every utterance with every verbiage, one matrix per call, and the utterances
+                    # ordered by starttime so each time window is a binary search
+                    verbiage_keys = list(verbiage_phrases)
+                    verbiage_embeddings = load_phrase_bank('verbiage')
+                    verbiage_windows = {}
+                    verbiage_chat = timely_closing_transcript_chat[
+                        timely_closing_transcript_chat['request_id'].isin(timely_closing_res_df['request_id'])]
+                    for window_request_id, utterances in verbiage_chat.groupby('request_id', sort=False):
+                        texts = utterances['transcript'].tolist()
+                        start_times = utterances['starttime'].to_numpy(dtype=float)
+                        # Utterances without a starttime never fall in a window
+                        by_time = np.flatnonzero(~np.isnan(start_times))
+                        by_time = by_time[np.argsort(start_times[by_time], kind='stable')]
+                        verbiage_windows[window_request_id] = (
+                            texts, start_times, by_time, start_times[by_time],
+                            embeddings.get_many(texts) @ verbiage_embeddings.T
+                        )
+
+                    # Position of the first utterance (in call order) starting at or after min_time that is similar
+                    # to the verbiage, or None
+                    def first_similar_after(window_request_id, phrase_key, min_time, threshold=0.7):
+                        if window_request_id not in verbiage_windows:
+                            return None
+                        _, _, by_time, sorted_times, similarities = verbiage_windows[window_request_id]
+                        in_window = by_time[np.searchsorted(sorted_times, min_time, side='left'):]
+                        similar = in_window[similarities[in_window, verbiage_keys.index(phrase_key)] > threshold]
+                        return similar.min() if len(similar) else None
 
                     # Function to check disconnection phrases after the disconnect_time
-                    def check_disconnection_phrases(disconnect_request_id, disconnect_time, disconnect_transcript_chat):
+                    def check_disconnection_phrases(disconnect_request_id, disconnect_time):
                         global i
-                        filtered_transcript = disconnect_transcript_chat[disconnect_transcript_chat['request_id'] ==
-                                                                         disconnect_request_id]
                         for dis_index, dis_row in timely_closing_res_df[timely_closing_res_df['request_id'] ==
                                                                         disconnect_request_id].iterrows():
                             time_offset = disconnect_time
@@ -1025,18 +756,15 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
                             for i in range(1, 4):
                                 phrase_key = f'disconnection_verbiage_{i}'
                                 next_phrase_time = time_offset + (5 if i == 1 else 3)
-                                matching_rows = filtered_transcript[
-                                    filtered_transcript['starttime'] >= next_phrase_time]
-                                for _, match_row in matching_rows.iterrows():
-                                    if is_similar(verbiage_phrases[phrase_key], match_row['transcript']):
-                                        # Found a semantically matching phrase within the allowed time window
-                                        timely_closing_res_df.loc[
-                                            dis_index, phrase_key] = f'Found ({match_row["transcript"]})'
-                                        timely_closing_res_df.loc[dis_index, f'{phrase_key}_time'] = match_row[
-                                            'starttime']
-                                        time_offset = match_row['starttime']  # Move the time forward for next phrase
-                                        found = True
-                                        break
+                                match = first_similar_after(disconnect_request_id, phrase_key, next_phrase_time)
+                                if match is not None:
+                                    texts, start_times = verbiage_windows[disconnect_request_id][:2]
+                                    # Found a semantically matching phrase within the allowed time window
+                                    timely_closing_res_df.loc[dis_index, phrase_key] = f'Found ({texts[match]})'
+                                    timely_closing_res_df.loc[dis_index, f'{phrase_key}_time'] = float(
+                                        start_times[match])
+                                    time_offset = float(start_times[match])  # Move the time forward for next phrase
+                                    found = True
                                 if not found:
                                     # Phrase not found, mark as 'Not Found'
                                     timely_closing_res_df.loc[dis_index, phrase_key] = 'Not Found'
@@ -1050,8 +778,7 @@ def processing_timely_closing(timely_closing_primary_info, timely_closing_transc
 
                     # Apply the function to all rows in DataModelling_res_df
                     for idx, row in timely_closing_res_df.iterrows():
-                        check_disconnection_phrases(row['request_id'], row['disconnect_time'],
-                                                    timely_closing_transcript_chat)
+                        check_disconnection_phrases(row['request_id'], row['disconnect_time'])
 
                     # Check for valid numeric types (int, float) before calculating differences
                     def calculate_time_diff(row, start_col, end_col):
@@ -1378,45 +1105,6 @@ def calculate_row_language_percentage_spacy(df):
     return language_df
 
 
-def classifyPersonalization(df: pd.DataFrame, request_ids=None):
-    results, errors = [], []
-    request_id_list = set(request_ids if request_ids else df["request_id"].tolist())
-
-    for row in df.to_dict('records'):  # Faster than iterrows()
-        request_id = row.get("request_id")
-        if request_id not in request_id_list:
-            continue
-
-        try:
-            transcript = row.get("transcript", "")
-            response = llm.invoke(f"{transcript}\n\n\n\n\n\n{prompt_Personalization}")
-            extracted = extract_json_objects(response.content)[0]
-
-            results.append({
-                'request_id': request_id,
-                'Personalization_result': clean_text(extracted.get('Personalization_result', 'N/A')),
-                'Personalization_Evidence': clean_text(extracted.get('Personalization_Evidence', 'N/A'))
-            })
-
-        except Exception as e:
-            errors.append(request_id)
-            error_message = str(e)
-            if ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in error_message:
-                results.append({
-                    'request_id': request_id,
-                    'Personalization_result': "Error 500",
-                    'Personalization_Evidence': str(e)})
-            else:
-                print(f"Error processing request_id {request_id}: {e}")
-                results.append({
-                    'request_id': request_id,
-                    'Personalization_result': "Error",
-                    'Personalization_Evidence': str(e)
-                })
-
-    return pd.DataFrame(results), errors
-
-
 def process_TimelyOpening(dataframe):
     # Convert 'starttime' to numeric, forcing errors to NaN if conversion fails
     dataframe['starttime'] = pd.to_numeric(dataframe['starttime'], errors='coerce')
@@ -1444,54 +1132,47 @@ def process_TimelyOpening(dataframe):
 
 
 def process_classification(classification_func, df, expected_columns, classification_name):
-    max_retries = 5
-    retry_delay = 5
     """
-    Handles classification with retries, validation, and error handling.
+    Handles classification with targeted retries, validation, and error handling.
+
+    The whole DataFrame is classified once; only the request IDs that failed are retried.
     """
-    for attempt in range(1, max_retries + 1):
-        print(f"Attempt {attempt}: Processing {classification_name}...")
-
-        # Perform classification
-        res_df, error_ids = classification_func(df)
-
-        # Retry for failed request IDs
-        if error_ids:
-            print(f"⚠️ Retrying classification for failed request IDs...")
-            res_df = retry_classification(df, res_df, classification_func, error_ids, expected_columns)
-
-        # If classification completely fails, retry the entire DataFrame
-        if res_df is None:
-            print(f"⚠️ Attempt {attempt} failed: No valid output. Retrying entire DataFrame...")
-            if attempt == max_retries:
-                reportError(
-                    f"❌ Max retries reached for {classification_name} classification. No valid output received.")
-                return None
-            time.sleep(retry_delay)
-            continue
+    print(f"Processing {classification_name}...")
+    if df.empty:
+        return pd.DataFrame(columns=["request_id"] + expected_columns)
 
-        # Validate Output
-        is_valid, missing_cols, extra_cols = validateDataframes(res_df, expected_columns + ["request_id"])
+    # Perform classification
+    res_df, error_ids = classification_func(df)
+
+    # Retry for failed request IDs
+    if error_ids:
+        print(f"⚠️ Retrying classification for {len(error_ids)} failed request IDs...")
+        res_df = retry_classification(df, res_df, classification_func, error_ids, expected_columns,
+                                      name=classification_name)
 
-        # Drop extra columns if any
-        if extra_cols:
-            print(f"⚠️ Dropping extra columns: {extra_cols}")
-            res_df = res_df.drop(columns=extra_cols, errors="ignore")
+    if res_df is None:
+        reportError(f"❌ {classification_name} classification returned no output.")
+        return None
 
-        # If output is valid, break the retry loop
-        if is_valid:
-            print(f"✅ {classification_name} processing complete")
-            return res_df
+    # Validate Output
+    _, missing_cols, extra_cols = validateDataframes(res_df, expected_columns + ["request_id"])
 
-        print(f"⚠️ Attempt {attempt} failed: Missing columns [{missing_cols}] detected. Retrying entire DataFrame...")
+    # Drop extra columns if any
+    if extra_cols:
+        print(f"⚠️ Dropping extra columns: {extra_cols}")
+        res_df = res_df.drop(columns=extra_cols, errors="ignore")
 
-        # If max retries are reached, log error and return None
-        if attempt == max_retries:
-            reportError(f"❌ Max retries reached for {classification_name} classification. Issues:\n"
-                        f"- Missing Columns: {missing_cols}")
-            return None
+    # Extra columns were dropped above, only missing ones make the output unusable
+    if missing_cols:
+        reportError(f"❌ {classification_name} classification produced invalid output. Issues:\n"
+                    f"- Missing Columns: {missing_cols}")
+        return None
 
-        time.sleep(retry_delay)
+    print(f"✅ {classification_name} processing complete")
+    cache_stats = get_cache_stats()
+    if cache_stats:
+        print(f"Gemini response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    return res_df
 
 
 def process_hold_data(transcriptChat_df):
@@ -1545,7 +1226,8 @@ def process_dead_air(primaryInfo_df, transcriptChat_df):
                 else:
                     dead_air_start = row['Prev_Endtime']
                     dead_air_end = row['starttime']
-                    dead_air_timestamp = f"[{dead_air_start} , {dead_air_end}]"
+                    # The timing columns are float64 since load, written with two decimals as stored in tutterances
+                    dead_air_timestamp = f"[{dead_air_start:.2f} , {dead_air_end:.2f}]"
                     hold_diff = pd.to_numeric(row["Holddiff"], errors='coerce')
                     hold_requested_before_dead_air = "Not Met" if hold_diff > 10 else "Met"
 
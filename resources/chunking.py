@@ -0,0 +1,124 @@
+import re
+
+NOT_AVAILABLE = {"", "n/a", "na", "none", "null", "[n/a]"}
+
+
+def _is_available(value):
+    return value is not None and str(value).strip().lower() not in NOT_AVAILABLE
+
+
+def _split_long_unit(unit, max_chars):
+    # A single utterance longer than a chunk is split at sentence boundaries, then hard-wrapped
+    pieces, current = [], ""
+    for sentence in re.split(r'(?<=[.?!।])\s+', unit):
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_transcript(transcript, max_chars):
+    """
+    Split a transcript into chunks of at most `max_chars` characters at utterance boundaries.
+
+    The transcript's own lines are the split units, so every chunk keeps the "Agent:"/"Customer:" speaker labels.
+    Transcripts that already fit are returned as a single chunk.
+    """
+    if not isinstance(transcript, str) or len(transcript) <= max_chars:
+        return [transcript]
+
+    units = [line for line in transcript.splitlines() if line.strip()]
+
+    chunks, current = [], []
+    current_length = 0
+    for unit in units:
+        for piece in (_split_long_unit(unit, max_chars) if len(unit) > max_chars else [unit]):
+            if current and current_length + len(piece) + 1 > max_chars:
+                chunks.append("\n".join(current))
+                current, current_length = [], 0
+            current.append(piece)
+            current_length += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks or [transcript]
+
+
+# Reducers combine the values a JSON key received in each chunk into one value
+def not_met_wins(values):
+    """'Not Met' in any chunk fails the whole call."""
+    cleaned = [str(value).strip() for value in values if _is_available(value)]
+    if "Not Met" in cleaned:
+        return "Not Met"
+    return "Met" if "Met" in cleaned else first_available(values)
+
+
+def yes_wins(values):
+    """'Yes' in any chunk means the event happened somewhere in the call."""
+    cleaned = [str(value).strip() for value in values if _is_available(value)]
+    if "Yes" in cleaned:
+        return "Yes"
+    return "No" if "No" in cleaned else first_available(values)
+
+
+def concat_evidence(values):
+    """Join the distinct evidence strings of all chunks."""
+    evidence = []
+    for value in values:
+        if _is_available(value) and str(value) not in evidence:
+            evidence.append(str(value))
+    return " | ".join(evidence) if evidence else first_available(values)
+
+
+def first_available(values):
+    """First chunk that produced a value."""
+    return next((value for value in values if _is_available(value)), values[0] if values else "N/A")
+
+
+def first_chunk(values):
+    """Parameters judged on the start of the call (opening) only trust the first chunk."""
+    return values[0] if values else "N/A"
+
+
+def last_chunk(values):
+    """Parameters judged on the end of the call (closing) only trust the last chunk."""
+    return values[-1] if values else "N/A"
+
+
+def default_reducer(values):
+    """Pick a reducer from the values themselves: Met/Not Met, Yes/No, or free text evidence."""
+    cleaned = {str(value).strip() for value in values if _is_available(value)}
+    if cleaned and cleaned <= {"Met", "Not Met"}:
+        return not_met_wins(values)
+    if cleaned and cleaned <= {"Yes", "No"}:
+        return yes_wins(values)
+    return concat_evidence(values)
+
+
+def reduce_chunk_results(results, reducers=None):
+    """
+    Merge the JSON objects returned for each chunk of a transcript into one object.
+
+    `reducers` is either a single reducer applied to every key, or a dict of key -> reducer (or nested dict for
+    nested objects). Keys without a reducer use `default_reducer`.
+    """
+    keys = []
+    for result in results:
+        keys.extend(key for key in result if key not in keys)
+
+    merged = {}
+    for key in keys:
+        values = [result[key] for result in results if key in result]
+        reducer = reducers.get(key) if isinstance(reducers, dict) else reducers
+
+        if all(isinstance(value, dict) for value in values):
+            merged[key] = reduce_chunk_results(values, reducer)
+        else:
+            merged[key] = (reducer if callable(reducer) else default_reducer)(values)
+    return merged
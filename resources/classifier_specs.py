@@ -0,0 +1,344 @@
+from dataclasses import dataclass
+
+from resources.chunking import first_chunk, last_chunk
+from resources.prompts import (RudeSarcastic_prompt, escalation_prompt, Supervisor_prompt, prompt_closing,
+                               prompt_opening, Empathy_apology_prompt, reassurance_prompt,
+                               Unethical_Solicitation_prompt, voice_of_customer_prompt, prompt_opening_lang,
+                               timely_closing_prompt, prompt_Personalization, DSAT_prompt)
+from resources.result_extractor_cleaner import clean_text
+
+# Gemini rejects transcripts that are too long with a 500, its message is matched to tell that case apart
+ERROR_DUE_TO_LONG_CALL_TRANSCRIPT = "500"
+ERROR_PLACEHOLDER = "{error}"
+LONG_CALL_ERROR_MESSAGE = "An unexpected error occurred on Google's side. Your input context is too long."
+
+
+@dataclass(frozen=True)
+class ClassifierSpec:
+    """
+    Declarative description of a per-transcript Gemini parameter.
+
+    `columns` maps every output column to the JSON key it is read from. `error_row` gives the value of every column
+    when the call fails ("{error}" is replaced by the error message), and `long_call_error_row` replaces it when
+    Gemini rejected the transcript as too long.
+    """
+    name: str
+    prompt: str
+    columns: dict
+    error_row: dict
+    long_call_error_row: dict = None
+    reducers: object = None
+    keep_transcript: bool = False
+    default: str = 'N/A'
+
+    def result_row(self, extracted):
+        return {column: clean_text(extracted.get(key, self.default)) for column, key in self.columns.items()}
+
+    def response_schema(self):
+        """JSON schema of the object the prompt asks for, used by Gemini's structured output mode."""
+        keys = list(dict.fromkeys(self.columns.values()))
+        return {"type": "object", "properties": {key: {"type": "string"} for key in keys}, "required": keys}
+
+    def failure_row(self, error):
+        message = str(error)
+        if self.long_call_error_row and ERROR_DUE_TO_LONG_CALL_TRANSCRIPT in message:
+            template = self.long_call_error_row
+        else:
+            template = self.error_row
+        return {column: value.replace(ERROR_PLACEHOLDER, message) for column, value in template.items()}
+
+
+RUDE_SARCASTIC_SPEC = ClassifierSpec(
+    name='RudeSarcastic',
+    prompt=RudeSarcastic_prompt,
+    columns={
+        'Sarcasm_rude_behaviour': 'Sarcasm_rude_behaviour',
+        'Sarcasm_rude_behaviour_evidence': 'Sarcasm_rude_behaviour_evidence'
+    },
+    error_row={'Sarcasm_rude_behaviour': "Error", 'Sarcasm_rude_behaviour_evidence': ERROR_PLACEHOLDER}
+)
+
+ESCALATION_SPEC = ClassifierSpec(
+    name='Escalation',
+    prompt=escalation_prompt,
+    columns={
+        'escalation_results': 'Value',
+        'Issue_Identification': 'Issue',
+        'Probable_Reason_for_Escalation': 'Reason',
+        'Probable_Reason_for_Escalation_Evidence': 'Evidence',
+        'Agent_Handling_Capability': 'Agent Handling Capability'
+    },
+    error_row={
+        'escalation_results': "Error",
+        'Issue_Identification': ERROR_PLACEHOLDER,
+        'Probable_Reason_for_Escalation': ERROR_PLACEHOLDER,
+        'Probable_Reason_for_Escalation_Evidence': ERROR_PLACEHOLDER,
+        'Agent_Handling_Capability': ERROR_PLACEHOLDER
+    }
+)
+
+SUPERVISOR_SPEC = ClassifierSpec(
+    name='Supervisor',
+    prompt=Supervisor_prompt,
+    columns={
+        'Wanted_to_connect_with_supervisor': 'Wanted_to_connect_with_supervisor',
+        'de_escalate': 'de_escalate',
+        'Supervisor_call_connected': 'Supervisor_call_connected',
+        'call_back_arranged_from_supervisor': 'call_back_arranged_from_supervisor',
+        'supervisor_evidence': 'supervisor_evidence',
+        'Denied_for_Supervisor_call': 'Denied_for_Supervisor_call',
+        'denied_evidence': 'denied_evidence'
+    },
+    error_row={
+        'Wanted_to_connect_with_supervisor': "Error",
+        'de_escalate': ERROR_PLACEHOLDER,
+        'Supervisor_call_connected': ERROR_PLACEHOLDER,
+        'call_back_arranged_from_supervisor': ERROR_PLACEHOLDER,
+        'supervisor_evidence': ERROR_PLACEHOLDER,
+        'Denied_for_Supervisor_call': ERROR_PLACEHOLDER,
+        'denied_evidence': ERROR_PLACEHOLDER
+    }
+)
+
+APOLOGY_EMPATHY_SPEC = ClassifierSpec(
+    name='ApologyEmpathy',
+    prompt=Empathy_apology_prompt,
+    columns={
+        'Apology_result': 'Apology',
+        'Apology_evidence': 'Apology Evidence',
+        'Empathy_result': 'Empathy',
+        'Empathy_evidence': 'Empathy Evidence',
+        'Apology_Category': 'Apology Category',
+        'Empathy_Category': 'Empathy Category'
+    },
+    error_row={
+        'Apology_result': "Error",
+        'Apology_evidence': ERROR_PLACEHOLDER,
+        'Empathy_result': "Error",
+        'Empathy_evidence': ERROR_PLACEHOLDER,
+        'Apology_Category': "Error",
+        'Empathy_Category': ERROR_PLACEHOLDER
+    },
+    long_call_error_row={
+        'Apology_result': "Error 500",
+        'Apology_evidence': LONG_CALL_ERROR_MESSAGE,
+        'Empathy_result': "Error 500",
+        'Empathy_evidence': LONG_CALL_ERROR_MESSAGE,
+        'Apology_Category': "Error 500",
+        'Empathy_Category': LONG_CALL_ERROR_MESSAGE
+    }
+)
+
+UNETHICAL_SOLICITATION_SPEC = ClassifierSpec(
+    name='UnethicalSolicitation',
+    prompt=Unethical_Solicitation_prompt,
+    columns={
+        'Unethical_Solicitation': 'Unethical_Solicitation',
+        'Unethical_Solicitation_Evidence': 'Unethical_Solicitation_Evidence'
+    },
+    error_row={'Unethical_Solicitation': "Error", 'Unethical_Solicitation_Evidence': ERROR_PLACEHOLDER},
+    long_call_error_row={
+        'Unethical_Solicitation': "Error 500",
+        'Unethical_Solicitation_Evidence': "An unexpected error occurred on the server side."
+    }
+)
+
+REASSURANCE_SPEC = ClassifierSpec(
+    name='Reassurance',
+    prompt=reassurance_prompt,
+    columns={
+        'Reassurance_result': 'Value',
+        'Reassurance_evidence': 'Evidence',
+        'Reassurance_Category': 'Category'
+    },
+    error_row={
+        'Reassurance_result': "Error",
+        'Reassurance_evidence': ERROR_PLACEHOLDER,
+        'Reassurance_Category': ERROR_PLACEHOLDER
+    },
+    long_call_error_row={
+        'Reassurance_result': "Error 500",
+        'Reassurance_evidence': "An unexpected error occurred on the server side.",
+        'Reassurance_Category': ERROR_PLACEHOLDER
+    }
+)
+
+CHAT_CLOSING_SPEC = ClassifierSpec(
+    name='ChatClosing',
+    prompt=prompt_closing,
+    columns={
+        'Further Assistance': 'Further Assistance',
+        'Further Assistance Evidence': 'Further Assistance Evidence',
+        'Effective IVR Survey': 'Effective IVR Survey',
+        'Effective IVR Survey Evidence': 'Effective IVR Survey Evidence',
+        'Branding': 'Branding',
+        'Branding Evidence': 'Branding Evidence',
+        'Greeting': 'Greeting',
+        'Greeting Evidence': 'Greeting Evidence'
+    },
+    error_row={
+        'Further Assistance': "Error",
+        'Further Assistance Evidence': ERROR_PLACEHOLDER,
+        'Effective IVR Survey': "Error",
+        'Effective IVR Survey Evidence': ERROR_PLACEHOLDER,
+        'Branding': "Error",
+        'Branding Evidence': ERROR_PLACEHOLDER,
+        'Greeting': "Error",
+        'Greeting Evidence': ERROR_PLACEHOLDER
+    },
+    long_call_error_row={
+        'Further Assistance': "Error 500",
+        'Further Assistance Evidence': LONG_CALL_ERROR_MESSAGE,
+        'Effective IVR Survey': "Error 500",
+        'Effective IVR Survey Evidence': LONG_CALL_ERROR_MESSAGE,
+        'Branding': "Error 500",
+        'Branding Evidence': LONG_CALL_ERROR_MESSAGE,
+        'Greeting': "Error 500",
+        'Greeting Evidence': LONG_CALL_ERROR_MESSAGE
+    },
+    reducers=last_chunk
+)
+
+CHAT_OPENING_SPEC = ClassifierSpec(
+    name='ChatOpening',
+    prompt=prompt_opening,
+    columns={
+        'Greeting_the_customer': 'Greeting the Customer',
+        'Greeting_the_customer_evidence': 'Greeting the Customer Evidence',
+        'Self_introduction': 'Self Introduction',
+        'Self_introduction_evidence': 'Self Introduction Evidence',
+        'Identity_confirmation': 'Customer Identity Confirmation',
+        'Identity_confirmation_evidence': 'Customer Identity Confirmation Evidence'
+    },
+    error_row={
+        'Greeting_the_customer': "Error",
+        'Greeting_the_customer_evidence': ERROR_PLACEHOLDER,
+        'Self_introduction': "Error",
+        'Self_introduction_evidence': ERROR_PLACEHOLDER,
+        'Identity_confirmation': "Error",
+        'Identity_confirmation_evidence': ERROR_PLACEHOLDER
+    },
+    long_call_error_row={
+        'Greeting_the_customer': "Error 500",
+        'Greeting_the_customer_evidence': LONG_CALL_ERROR_MESSAGE,
+        'Self_introduction': "Error 500",
+        'Self_introduction_evidence': LONG_CALL_ERROR_MESSAGE,
+        'Identity_confirmation': "Error 500",
+        'Identity_confirmation_evidence': LONG_CALL_ERROR_MESSAGE
+    },
+    reducers=first_chunk
+)
+
+DSAT_SPEC = ClassifierSpec(
+    name='DSAT',
+    prompt=DSAT_prompt,
+    columns={
+        'Customer_Issue_Identification': 'Customer_Issue_Identification',
+        'Reason_for_DSAT': 'Reason_for_DSAT',
+        'Suggestion_for_DSAT_Prevention': 'Suggestion_for_DSAT_Prevention'
+    },
+    error_row={
+        'Customer_Issue_Identification': "Error",
+        'Reason_for_DSAT': "Error",
+        'Suggestion_for_DSAT_Prevention': ERROR_PLACEHOLDER
+    },
+    long_call_error_row={
+        'Customer_Issue_Identification': "Error 500",
+        'Reason_for_DSAT': "Error",
+        'Suggestion_for_DSAT_Prevention': ERROR_PLACEHOLDER
+    }
+)
+
+VOICE_OF_CUSTOMER_SPEC = ClassifierSpec(
+    name='VoiceOfCustomer',
+    prompt=voice_of_customer_prompt,
+    columns={
+        'VOC_Category': 'Category',
+        'VOC_Core_Issue_Summary': 'Core_Issue_Summary'
+    },
+    error_row={'VOC_Category': "Error", 'VOC_Core_Issue_Summary': ERROR_PLACEHOLDER},
+    long_call_error_row={'VOC_Category': "Error 500", 'VOC_Core_Issue_Summary': LONG_CALL_ERROR_MESSAGE}
+)
+
+OPENING_LANG_SPEC = ClassifierSpec(
+    name='OpeningLang',
+    prompt=prompt_opening_lang,
+    columns={
+        'Open the call in default language': 'default_opening_lang',
+        'Open the call in default language evidence': 'Evidence',
+        'Open the call in default language Reason': 'Reason'
+    },
+    error_row={
+        'Open the call in default language': "Error",
+        'Open the call in default language evidence': ERROR_PLACEHOLDER,
+        'Open the call in default language Reason': "Error"
+    },
+    long_call_error_row={
+        'Open the call in default language': "Error 500",
+        'Open the call in default language evidence': ERROR_PLACEHOLDER,
+        'Open the call in default language Reason': "Error"
+    },
+    reducers=first_chunk
+)
+
+TIMELY_CLOSING_SPEC = ClassifierSpec(
+    name='TimelyClosing',
+    prompt=timely_closing_prompt,
+    columns={
+        'Category': 'Category',
+        'Summary': 'Summary',
+        'Supporting_Evidence': 'Supporting_Evidence'
+    },
+    error_row={'Category': "Error", 'Summary': ERROR_PLACEHOLDER, 'Supporting_Evidence': "Error"},
+    long_call_error_row={'Category': "Error", 'Summary': "Server Error", 'Supporting_Evidence': "Error"},
+    reducers=last_chunk,
+    keep_transcript=True
+)
+
+PERSONALIZATION_SPEC = ClassifierSpec(
+    name='Personalization',
+    prompt=prompt_Personalization,
+    columns={
+        'Personalization_result': 'Personalization_result',
+        'Personalization_Evidence': 'Personalization_Evidence'
+    },
+    error_row={'Personalization_result': "Error", 'Personalization_Evidence': ERROR_PLACEHOLDER},
+    long_call_error_row={'Personalization_result': "Error 500", 'Personalization_Evidence': ERROR_PLACEHOLDER}
+)
+
+CLASSIFIER_SPECS = {spec.name: spec for spec in [
+    RUDE_SARCASTIC_SPEC, ESCALATION_SPEC, SUPERVISOR_SPEC, APOLOGY_EMPATHY_SPEC, UNETHICAL_SOLICITATION_SPEC,
+    REASSURANCE_SPEC, CHAT_CLOSING_SPEC, CHAT_OPENING_SPEC, DSAT_SPEC, VOICE_OF_CUSTOMER_SPEC, OPENING_LANG_SPEC,
+    TIMELY_CLOSING_SPEC, PERSONALIZATION_SPEC
+]}
+
+# Parameters that are asked for every transcript and can therefore share a fused prompt
+FUSABLE_PARAMETERS = ['RudeSarcastic', 'Escalation', 'Supervisor', 'ApologyEmpathy', 'UnethicalSolicitation',
+                      'Reassurance', 'ChatClosing', 'ChatOpening', 'VoiceOfCustomer', 'OpeningLang',
+                      'Personalization']
+
+BRCP_FUSED_SECTIONS = ['RudeSarcastic', 'Escalation', 'Supervisor']
+
+
+def fused_response_schema(specs):
+    """JSON schema of the answer to a fused prompt: one object per spec, keyed by spec name."""
+    return {"type": "object", "properties": {spec.name: spec.response_schema() for spec in specs},
+            "required": [spec.name for spec in specs]}
+
+
+def gemini_schema(schema):
+    """
+    Convert a JSON schema to Gemini's Schema format, whose `type` is an enum name (OBJECT, STRING, ...) rather than
+    the lowercase JSON schema type.
+    """
+    if isinstance(schema, dict):
+        return {key: value.upper() if key == "type" and isinstance(value, str) else gemini_schema(value)
+                for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [gemini_schema(item) for item in schema]
+    return schema
+
+
+def structured_output_config(schema):
+    """generation_config asking Gemini for bare JSON matching the JSON schema `schema`."""
+    return {"response_mime_type": "application/json", "response_schema": gemini_schema(schema)}
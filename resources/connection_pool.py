@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+
+
+class PooledConnection:
+    """
+    Wrapper around a DB-API connection checked out of a ConnectionPool.
+
+    Behaves like the underlying connection, except that close() hands it back to the pool instead of closing it.
+    """
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if not self._returned:
+            self._returned = True
+            self._pool.release(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections created by `connect`.
+
+    Connections are validated with `validation_query` when they are checked out, and connections that were idle for
+    longer than `max_idle_seconds` are closed (while keeping at least `min_size` open). At most `max_size`
+    connections exist at the same time; further checkouts wait up to `checkout_timeout` seconds.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=5, max_idle_seconds=300, checkout_timeout=30,
+                 validation_query="SELECT 1"):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.validation_query = validation_query
+
+        self._idle = deque()  # (connection, returned_at), most recently returned on the right
+        self._open = 0
+        self._condition = threading.Condition()
+
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.reused = 0
+        self.validation_failures = 0
+        self.waits = 0
+
+    def _is_alive(self, connection):
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self.validation_query)
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        # Called without the lock held; closing a dead connection can block on the network
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._open -= 1
+            self.closed += 1
+            self._condition.notify()
+
+    def acquire(self):
+        """Check out a validated connection, opening a new one if none is idle and the pool is not full."""
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            with self._condition:
+                candidate, returned_at = self._idle.pop() if self._idle else (None, None)
+                if candidate is None and self._open < self.max_size:
+                    self._open += 1
+                    create = True
+                elif candidate is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No database connection available within {self.checkout_timeout}s")
+                    self.waits += 1
+                    self._condition.wait(timeout=remaining)
+                    continue
+                else:
+                    create = False
+
+            if create:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self.created += 1
+                    self.checkouts += 1
+                return PooledConnection(self, connection)
+
+            idle_too_long = self.max_idle_seconds and time.monotonic() - returned_at > self.max_idle_seconds
+            if idle_too_long and self._open > self.min_size:
+                self._discard(candidate)
+                continue
+            if not self._is_alive(candidate):
+                with self._condition:
+                    self.validation_failures += 1
+                self._discard(candidate)
+                continue
+
+            with self._condition:
+                self.checkouts += 1
+                self.reused += 1
+            return PooledConnection(self, candidate)
+
+    def release(self, connection):
+        """Return a connection to the pool, discarding it if its open transaction cannot be rolled back."""
+        try:
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            return
+
+        expired = []
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            # Recycle connections nobody has needed for a while, oldest first
+            while len(self._idle) > self.min_size and self.max_idle_seconds \
+                    and time.monotonic() - self._idle[0][1] > self.max_idle_seconds:
+                expired.append(self._idle.popleft()[0])
+            self._condition.notify()
+        for stale in expired:
+            self._discard(stale)
+
+    def close_all(self):
+        """Close every idle connection. Checked-out connections are closed when they are returned."""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self):
+        """Return the pool size and checkout counters for monitoring."""
+        with self._condition:
+            return {
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "created": self.created,
+                "closed": self.closed,
+                "checkouts": self.checkouts,
+                "reused": self.reused,
+                "validation_failures": self.validation_failures,
+                "waits": self.waits,
+            }
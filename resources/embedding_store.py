@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+SQLITE_MAX_KEYS_PER_QUERY = 500
+
+
+def text_key(model, text):
+    """Cache key of the embedding of `text` by `model`."""
+    return hashlib.sha256(f"{model}|{text}".encode("utf-8")).hexdigest()
+
+
+class PersistentEmbeddingCache:
+    """
+    On-disk LRU cache of sentence embeddings (float32) keyed by text_key, shared by every run of the process.
+
+    The least recently used entries are evicted once more than `max_entries` are stored.
+    """
+
+    def __init__(self, path, max_entries=500000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """Return a dict of key -> vector for the keys that are cached."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_MAX_KEYS_PER_QUERY):
+                chunk = keys[start:start + SQLITE_MAX_KEYS_PER_QUERY]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+            self._conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?",
+                                   [(now, key) for key in found])
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, vector) pairs and evict the least recently used entries over `max_entries`."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items]
+            )
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if entries > self.max_entries:
+                cursor = self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)", (entries - self.max_entries,)
+                )
+                self.evictions += max(cursor.rowcount, 0)
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the number of stored embeddings."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+
+class EmbeddingStore:
+    """
+    Embeddings of the texts seen during one run, keyed by text hash, so each distinct text is encoded once.
+
+    Texts missing from the store are looked up in the optional `persistent` cache and the rest are encoded with
+    `encode` (texts -> 2D array) in one batch per get_many() call.
+    """
+
+    def __init__(self, encode, model, persistent=None):
+        self._encode = encode
+        self.model = model
+        self.persistent = persistent
+        self._vectors = {}
+        self.lookups = 0
+        self.encoded = 0
+        self.from_persistent = 0
+
+    def get_many(self, texts):
+        """Embeddings of `texts` as a 2D array, one row per text."""
+        keys = [text_key(self.model, text) for text in texts]
+        self.lookups += len(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._vectors:
+                missing.setdefault(key, text)
+
+        if missing and self.persistent is not None:
+            found = self.persistent.get_many(list(missing))
+            self._vectors.update(found)
+            self.from_persistent += len(found)
+            missing = {key: text for key, text in missing.items() if key not in found}
+
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            self._vectors.update(zip(missing, vectors))
+            self.encoded += len(missing)
+            if self.persistent is not None:
+                self.persistent.put_many(list(zip(missing, vectors)))
+
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack([self._vectors[key] for key in keys])
+
+    def get(self, text):
+        """Embedding of a single text."""
+        return self.get_many([text])[0]
+
+    def stats(self):
+        """Return lookup, encode and persistent cache counters of this run."""
+        return {"texts": len(self._vectors), "lookups": self.lookups, "encoded": self.encoded,
+                "from_persistent": self.from_persistent}
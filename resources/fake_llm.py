@@ -0,0 +1,165 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+
+# Hints in the prompt templates that ask for free text rather than one of a fixed set of values
+FREE_TEXT_HINTS = ("evidence", "summary", "explanation", "reason", "issue", "capability", "phrases", "name")
+
+
+class FakeMessage:
+    """Minimal stand-in for the langchain AIMessage returned by ChatGoogleGenerativeAI.invoke."""
+
+    def __init__(self, content, usage_metadata):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+
+def _estimate_tokens(text):
+    # Gemini averages roughly four characters per token for English/Hinglish text
+    return max(1, len(text) // 4)
+
+
+def _template_keys(text):
+    """Keys of the last JSON template (```json block or *Output Format* section) of a prompt."""
+    blocks = re.findall(r'json\s*(\{.*?\n\s*\})', text, re.DOTALL)
+    if not blocks:
+        return []
+    return list(dict.fromkeys(re.findall(r'["\']([^"\'\n]+)["\']\s*:', blocks[-1])))
+
+
+def _value_hint(text, key):
+    match = re.search(r'["\']' + re.escape(key) + r'["\']\s*:\s*(.+)', text)
+    return match.group(1).strip().rstrip(",") if match else ""
+
+
+def _value_options(hint):
+    """Possible values of a template field, e.g. "Met" or "Not Met" / "<Yes/No/N/A>". Empty for free text."""
+    if any(word in hint.lower() for word in FREE_TEXT_HINTS):
+        return []
+    quoted = re.findall(r'["\']([^"\'<>]+)["\']', hint)
+    if len(quoted) > 1:
+        return quoted
+    inner = hint.strip("\"'<> ")
+    if "/" in inner:
+        return [option.strip() for option in re.split(r'/(?!A\b)', inner) if option.strip()]
+    return []
+
+
+class FakeGeminiLLM:
+    """
+    Offline replacement for the Gemini chat model, for load tests without network access or quota.
+
+    Every call sleeps for a latency drawn from `latency_distribution` ("none", "fixed", "uniform" or "lognormal"),
+    may fail with a 429 or 500 error, may return malformed JSON, and otherwise answers with a JSON object that has
+    the keys requested by the prompt (or by the response schema, when one is given).
+    """
+
+    def __init__(self, latency_distribution="lognormal", latency_mean=1.5, latency_stddev=0.5,
+                 throttle_rate=0.0, server_error_rate=0.0, malformed_rate=0.0, seed=None):
+        self.latency_distribution = latency_distribution
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.throttle_rate = throttle_rate
+        self.server_error_rate = server_error_rate
+        self.malformed_rate = malformed_rate
+
+        self.calls = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.malformed = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _latency(self):
+        if self.latency_distribution == "none" or self.latency_mean <= 0:
+            return 0.0
+        if self.latency_distribution == "fixed":
+            return self.latency_mean
+        if self.latency_distribution == "uniform":
+            return self._random.uniform(max(0.0, self.latency_mean - self.latency_stddev),
+                                        self.latency_mean + self.latency_stddev)
+        # Log-normal with the configured mean and standard deviation, which matches the long tail of real calls
+        sigma2 = math.log(1 + (self.latency_stddev / self.latency_mean) ** 2)
+        return self._random.lognormvariate(math.log(self.latency_mean) - sigma2 / 2, math.sqrt(sigma2))
+
+    def _fake_value(self, key, hint):
+        options = _value_options(hint)
+        if options:
+            return self._random.choice(options)
+        return f"Fake {key} generated offline"
+
+    def _fake_object(self, prompt_text, keys):
+        return {key: self._fake_value(key, _value_hint(prompt_text, key)) for key in keys}
+
+    def _fake_answer(self, prompt_text, response_schema):
+        if response_schema:
+            return self._answer_from_schema(prompt_text, response_schema)
+
+        # Fused prompts: one object per section, keyed by section name
+        sections = re.findall(r'### Section: (.+?)\n(.*?)\n### End of Section: \1', prompt_text, re.DOTALL)
+        if sections:
+            return {name: self._fake_object(text, _template_keys(text)) for name, text in sections}
+        return self._fake_object(prompt_text, _template_keys(prompt_text))
+
+    def _answer_from_schema(self, prompt_text, schema):
+        answer = {}
+        for key, property_schema in schema.get("properties", {}).items():
+            if str(property_schema.get("type", "")).lower() == "object":  # JSON schema or Gemini enum spelling
+                section = re.search(r'### Section: ' + re.escape(key) + r'\n(.*?)\n### End of Section', prompt_text,
+                                    re.DOTALL)
+                answer[key] = self._answer_from_schema(section.group(1) if section else prompt_text, property_schema)
+            else:
+                answer[key] = self._fake_value(key, _value_hint(prompt_text, key))
+        return answer
+
+    def invoke(self, prompt_text, generation_config=None, response_schema=None, **kwargs):
+        """Answer like ChatGoogleGenerativeAI.invoke, returning an object with `.content` and `.usage_metadata`."""
+        generation_config = generation_config or {}
+        response_schema = response_schema or generation_config.get("response_schema")
+        json_mode = generation_config.get("response_mime_type") == "application/json"
+
+        time.sleep(self._latency())
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += _estimate_tokens(prompt_text)
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                self.throttled += 1
+                raise RuntimeError("429 Resource has been exhausted (e.g. check quota).")
+            if roll < self.throttle_rate + self.server_error_rate:
+                self.server_errors += 1
+                raise RuntimeError("500 An internal error has occurred. Please retry or report in "
+                                   "https://developers.generativeai.google/guide/troubleshooting")
+            malformed = self._random.random() < self.malformed_rate
+            answer = json.dumps(self._fake_answer(prompt_text, response_schema), ensure_ascii=False, indent=4)
+
+        content = answer if json_mode else f"```json\n{answer}\n```"
+        if malformed:
+            # Cut the answer off mid-object, like a response that hit the output limit
+            content = content[:max(1, len(content) // 2)]
+            with self._lock:
+                self.malformed += 1
+
+        output_tokens = _estimate_tokens(content)
+        with self._lock:
+            self.output_tokens += output_tokens
+        usage = {"input_tokens": _estimate_tokens(prompt_text), "output_tokens": output_tokens,
+                 "total_tokens": _estimate_tokens(prompt_text) + output_tokens}
+        return FakeMessage(content, usage)
+
+    def stats(self):
+        """Return call, fault and token counters."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "server_errors": self.server_errors,
+                "malformed": self.malformed,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+            }
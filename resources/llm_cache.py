@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ModuleNotFoundError:  # zstandard is optional, fall back to zlib
+    zstandard = None
+
+
+def _sha256(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk cache of Gemini responses keyed by model name, prompt hash and transcript hash.
+
+    Entries are stored compressed in SQLite. Entries older than `ttl_seconds` are treated as misses,
+    and the least recently used entries are evicted once the stored size exceeds `max_bytes`.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, ttl_seconds=72 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                response BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at)")
+        self._conn.commit()
+        # Running total of the stored sizes, so puts never have to scan the table
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model, prompt, transcript):
+        """Build the content-addressed cache key for a model/prompt/transcript combination."""
+        return _sha256(f"{model}|{_sha256(prompt)}|{_sha256(transcript)}")
+
+    @staticmethod
+    def _compress(text):
+        data = text.encode("utf-8")
+        if zstandard is not None:
+            return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+        return "zlib", zlib.compress(data)
+
+    @staticmethod
+    def _decompress(codec, blob):
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+        return zlib.decompress(blob).decode("utf-8")
+
+    def get(self, model, prompt, transcript, validate=None):
+        """
+        Return the cached response text, or None on a miss.
+
+        An entry that cannot be decoded, or that `validate` rejects by raising, is deleted and counted as a miss.
+        """
+        key = self.make_key(model, prompt, transcript)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT codec, response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            response = None
+            if row is not None and not (self.ttl_seconds and now - row[2] > self.ttl_seconds):
+                try:
+                    response = self._decompress(row[0], row[1])
+                except Exception:
+                    response = None  # e.g. a zstd entry read without zstandard installed
+            if response is not None and validate is not None:
+                try:
+                    validate(response)
+                except Exception:
+                    response = None
+
+            if response is None:
+                if row is not None:
+                    self._delete([key])
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return response
+
+    def put(self, model, prompt, transcript, response):
+        """Store a response and evict least recently used entries if the cache is over its size limit."""
+        key = self.make_key(model, prompt, transcript)
+        codec, blob = self._compress(response)
+        now = time.time()
+        with self._lock:
+            self._delete([key])  # keeps the running total right when an entry is replaced
+            self._conn.execute(
+                "INSERT INTO responses (key, model, codec, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, codec, blob, len(blob), now, now)
+            )
+            self._total_bytes += len(blob)
+            self._evict()
+            self._conn.commit()
+
+    def _delete(self, keys):
+        # Delete entries and subtract their sizes from the running total. Called with the lock held.
+        for key in keys:
+            row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+
+    def _evict(self):
+        if self.ttl_seconds:
+            expired = [key for key, in self._conn.execute("SELECT key FROM responses WHERE created_at < ?",
+                                                          (time.time() - self.ttl_seconds,))]
+            self._delete(expired)
+            self.evictions += len(expired)
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Drop the least recently used entries until the cache is back under its limit
+        stale_keys = []
+        remaining = self._total_bytes
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if remaining <= self.max_bytes:
+                break
+            stale_keys.append(key)
+            remaining -= size
+        self._delete(stale_keys)
+        self.evictions += len(stale_keys)
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the cache."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            size = self._total_bytes
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
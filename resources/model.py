@@ -1,9 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI
 from sentence_transformers import SentenceTransformer
 
+from resources.classifier_specs import structured_output_config
+from resources.embedding_store import EmbeddingStore, PersistentEmbeddingCache
+from resources.fake_llm import FakeGeminiLLM
+from resources.llm_cache import ResponseCache
+from resources.rate_limiter import AdaptiveRateLimiter
+from resources.result_extractor_cleaner import extract_json_objects
+
 load_dotenv()
 
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=os.getenv("GEMINI_API"))
-timely_closing_ST_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+GEMINI_MODEL_NAME = "gemini-1.5-flash"
+SENTENCE_TRANSFORMER_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# "gemini" calls the real API, "fake" answers offline with FakeGeminiLLM for load tests
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "lognormal")
+FAKE_LLM_LATENCY_MEAN = float(os.getenv("FAKE_LLM_LATENCY_MEAN", "1.5"))
+FAKE_LLM_LATENCY_STDDEV = float(os.getenv("FAKE_LLM_LATENCY_STDDEV", "0.5"))
+FAKE_LLM_THROTTLE_RATE = float(os.getenv("FAKE_LLM_THROTTLE_RATE", "0"))
+FAKE_LLM_SERVER_ERROR_RATE = float(os.getenv("FAKE_LLM_SERVER_ERROR_RATE", "0"))
+FAKE_LLM_MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0"))
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED")
+
+# Maximum number of Gemini requests in flight at once. The rate limiter starts at 2 and grows towards this limit
+# while Gemini keeps answering; 1 keeps the old sequential behaviour.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# On-disk response cache, so re-running the same upload does not pay for the same transcripts again
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/gemini_responses.sqlite")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "512"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "72"))
+
+# Client-side rate limiting shared by every stage and concurrent run in this process
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LLM_INITIAL_RPS = float(os.getenv("LLM_INITIAL_RPS", "2"))
+LLM_MAX_RPS = float(os.getenv("LLM_MAX_RPS", "10"))
+
+# Ask Gemini for JSON directly (response_mime_type + per-parameter response schema) instead of a ```json block.
+# tests/test_structured_output.py checks the config against the SDK's GenerationConfig; off by default until it has
+# been run against the live API.
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "false").lower() == "true"
+
+if LLM_BACKEND == "fake":
+    llm = FakeGeminiLLM(latency_distribution=FAKE_LLM_LATENCY, latency_mean=FAKE_LLM_LATENCY_MEAN,
+                        latency_stddev=FAKE_LLM_LATENCY_STDDEV, throttle_rate=FAKE_LLM_THROTTLE_RATE,
+                        server_error_rate=FAKE_LLM_SERVER_ERROR_RATE, malformed_rate=FAKE_LLM_MALFORMED_RATE,
+                        seed=int(FAKE_LLM_SEED) if FAKE_LLM_SEED else None)
+else:
+    llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL_NAME, google_api_key=os.getenv("GEMINI_API"))
+timely_closing_ST_model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL_NAME)
+
+# Sentences per forward pass when encoding with the sentence transformer
+ST_ENCODE_BATCH_SIZE = int(os.getenv("ST_ENCODE_BATCH_SIZE", "256"))
+
+# Optional on-disk LRU tier behind the per-run utterance embedding stores
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "false").lower() == "true"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "cache/utterance_embeddings.sqlite")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+
+response_cache = ResponseCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+                               ttl_seconds=LLM_CACHE_TTL_HOURS * 3600) if LLM_CACHE_ENABLED else None
+gemini_rate_limiter = AdaptiveRateLimiter(initial_rate=min(LLM_INITIAL_RPS, LLM_MAX_RPS), max_rate=LLM_MAX_RPS,
+                                          initial_concurrency=min(2, LLM_MAX_CONCURRENCY),
+                                          max_concurrency=LLM_MAX_CONCURRENCY) if LLM_RATE_LIMIT_ENABLED else None
+embedding_cache = PersistentEmbeddingCache(EMBEDDING_CACHE_PATH, max_entries=EMBEDDING_CACHE_MAX_ENTRIES) \
+    if EMBEDDING_CACHE_ENABLED else None
+
+
+def encode_normalized(texts):
+    """Sentence transformer embeddings of `texts` as a float32 array of unit vectors (dot product = cosine)."""
+    return timely_closing_ST_model.encode(list(texts), batch_size=ST_ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                          normalize_embeddings=True)
+
+
+def new_embedding_store():
+    """A per-run EmbeddingStore for the sentence transformer, backed by the persistent cache when enabled."""
+    return EmbeddingStore(encode_normalized, SENTENCE_TRANSFORMER_MODEL_NAME, persistent=embedding_cache)
+
+
+def get_embedding_cache_stats():
+    """Return persistent embedding cache counters, or None if the cache is disabled."""
+    return embedding_cache.stats() if embedding_cache is not None else None
+
+
+def build_prompt(transcript, prompt):
+    """Build the text sent to Gemini for a single transcript."""
+    return f"{transcript}\n\n\n\n\n\n{prompt}"
+
+
+def _require_json(content):
+    if not extract_json_objects(content):
+        raise ValueError("No JSON object found in Gemini response")
+
+
+def invoke_llm(transcript, prompt, response_schema=None, validate=None):
+    """
+    Invoke Gemini for a single transcript and return the response text, using the response cache if enabled.
+
+    With LLM_STRUCTURED_OUTPUT, `response_schema` (a JSON schema of the expected object) is sent along and Gemini
+    answers with bare JSON. `validate` is the caller's response parser: only answers it accepts are cached or served
+    from the cache, so a retry never gets the same broken answer back.
+    """
+    validate = validate or _require_json
+    kwargs = {}
+    # Fake answers must never be served to a real run from the shared cache
+    cache_model = GEMINI_MODEL_NAME if LLM_BACKEND != "fake" else f"fake:{GEMINI_MODEL_NAME}"
+    if LLM_STRUCTURED_OUTPUT and response_schema:
+        kwargs["generation_config"] = structured_output_config(response_schema)
+        # The schema is derived from the prompt, so the JSON-mode answers only need their own model namespace
+        cache_model = f"{cache_model}:json"
+    elif LLM_BACKEND == "fake" and response_schema:
+        # The fake reads the expected keys from the schema, since not every prompt carries a parsable template
+        kwargs["response_schema"] = response_schema
+
+    if response_cache is not None:
+        cached = response_cache.get(cache_model, prompt, transcript, validate=validate)
+        if cached is not None:
+            return cached
+
+    if gemini_rate_limiter is not None:
+        with gemini_rate_limiter.slot():
+            content = llm.invoke(build_prompt(transcript, prompt), **kwargs).content
+    else:
+        content = llm.invoke(build_prompt(transcript, prompt), **kwargs).content
+
+    if response_cache is not None:
+        try:
+            validate(content)
+        except Exception:
+            return content  # left to the caller's error handling, and not cached
+        response_cache.put(cache_model, prompt, transcript, content)
+    return content
+
+
+def get_cache_stats():
+    """Return response cache hit/miss counters, or None if the cache is disabled."""
+    return response_cache.stats() if response_cache is not None else None
+
+
+def get_rate_limiter_stats():
+    """Return the current Gemini request rate and concurrency limit, or None if rate limiting is disabled."""
+    return gemini_rate_limiter.stats() if gemini_rate_limiter is not None else None
+
+
+def get_fake_llm_stats():
+    """Return call, fault and token counters of the offline fake, or None when the real Gemini API is used."""
+    return llm.stats() if LLM_BACKEND == "fake" else None
+
+
+def invoke_llm_batch(transcripts, prompt, max_workers=None, response_schema=None, validate=None):
+    """
+    Invoke Gemini for every transcript with at most `max_workers` requests in flight.
+
+    Results are returned in the same order as `transcripts`. A failed call does not stop the batch;
+    its exception is returned in place of the response text so callers can build their error rows.
+    """
+    max_workers = max_workers or LLM_MAX_CONCURRENCY
+
+    def call(transcript):
+        try:
+            return invoke_llm(transcript, prompt, response_schema, validate)
+        except Exception as e:
+            return e
+
+    if max_workers <= 1 or len(transcripts) <= 1:
+        return [call(transcript) for transcript in transcripts]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(call, transcripts))
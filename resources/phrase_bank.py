@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from resources.model import SENTENCE_TRANSFORMER_MODEL_NAME, encode_normalized
+from resources.phrases import survey_phrases, feedback_phrases, disconnect_phrases_en, disconnect_phrases_hi, \
+    verbiage_phrases, timely_closing_reference_phrases
+
+# Encoded phrase lists are written here once and memory-mapped afterwards
+PHRASE_BANK_DIR = os.getenv("PHRASE_BANK_DIR", "cache/phrase_banks")
+
+# Fixed phrase lists compared against transcripts with the sentence transformer, by bank name
+PHRASE_LISTS = {
+    "survey": survey_phrases,
+    "feedback": feedback_phrases,
+    "disconnect_en": disconnect_phrases_en,
+    "disconnect_hi": disconnect_phrases_hi,
+    "timely_closing_reference": timely_closing_reference_phrases,
+    "verbiage": list(verbiage_phrases.values()),
+}
+
+_banks = {}
+_banks_lock = threading.Lock()
+
+
+def phrase_bank_path(name, phrases, model_name=SENTENCE_TRANSFORMER_MODEL_NAME):
+    """File of a phrase bank, keyed by model name and a hash of the phrases so edits to phrases.py rebuild it."""
+    digest = hashlib.sha256(json.dumps([model_name, phrases], ensure_ascii=False).encode("utf-8")).hexdigest()
+    return os.path.join(PHRASE_BANK_DIR, f"{model_name.replace('/', '_')}-{name}-{digest[:16]}.npy")
+
+
+def load_phrase_bank(name):
+    """
+    Normalized embeddings of the PHRASE_LISTS entry `name`, one row per phrase.
+
+    The array is encoded and saved the first time, then loaded read-only with mmap_mode="r", so every process
+    shares the same pages. Each bank is loaded once per process.
+    """
+    with _banks_lock:
+        if name not in _banks:
+            phrases = PHRASE_LISTS[name]
+            path = phrase_bank_path(name, phrases)
+            if not os.path.exists(path):
+                os.makedirs(PHRASE_BANK_DIR, exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    np.save(f, encode_normalized(phrases).astype(np.float32))
+                os.replace(temp_path, path)  # atomic, so concurrent workers never read a partial file
+                print(f"Phrase bank {name}: encoded {len(phrases)} phrases to {path}")
+            _banks[name] = np.load(path, mmap_mode="r")
+        return _banks[name]
+
+
+def preload_phrase_banks():
+    """Load every phrase bank, at startup, instead of on the first timely closing run."""
+    return {name: load_phrase_bank(name).shape for name in PHRASE_LISTS}
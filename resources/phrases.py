@@ -156,3 +156,6 @@ verbiage_phrases = {
     'disconnection_verbiage_3': "As there is no response from your side, I am going ahead and disconnecting the call. "
                                 "Thank you for your time, and have a great day/evening ahead."
 }
+
+# Categories of the timely closing classification that mean the call does not need the disconnection checks
+timely_closing_reference_phrases = ['The customer agreed to give feedback', 'Incomplete feedback request', ' [N/A]']
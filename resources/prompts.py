@@ -474,3 +474,41 @@ Output Format:
     "Personalization_Evidence": "<evidence from the transcript>"
 }
 """
+
+
+def _close_code_fence(prompt):
+    # Several prompts end inside an unterminated ```json block; close it so sections do not run together
+    return prompt + "\n```" if prompt.count("```") % 2 else prompt
+
+
+def build_fused_prompt(sections):
+    """
+    Combine several parameter prompts into a single request for the same transcript.
+
+    `sections` is a list of (section_name, prompt) pairs. The model is asked to answer every section and return one
+    JSON object keyed by section name, so the transcript is only sent once.
+    """
+    section_names = [name for name, _ in sections]
+    section_texts = "\n\n".join(
+        f"### Section: {name}\n{_close_code_fence(prompt.strip())}\n### End of Section: {name}"
+        for name, prompt in sections
+    )
+    response_template = ",\n".join(
+        f'    "{name}": {{ <the JSON object requested in the "{name}" section> }}' for name in section_names
+    )
+    return f"""
+You are a helpful and objective AI assistant auditing the transcript provided above. You have to carry out {len(sections)} independent evaluations of the same transcript. Each evaluation is described in its own section below, together with the JSON object it must produce.
+
+Apply the instructions of every section to the whole transcript, independently of the other sections. Do not let the criteria of one section influence another.
+
+{section_texts}
+
+**Final Output Format:**
+Do not return a separate JSON block per section. Return exactly one JSON object whose top-level keys are the section names ({", ".join(section_names)}) and whose values are the JSON objects requested by each section, in the following format:
+
+```json
+{{
+{response_template}
+}}
+```
+"""
@@ -0,0 +1,111 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Substrings of Gemini errors that mean we are being throttled rather than that the request itself is bad
+THROTTLING_ERROR_MARKERS = ("429", "503", "resource has been exhausted", "resourceexhausted", "quota",
+                            "rate limit", "unavailable", "overloaded")
+
+
+def is_throttling_error(error):
+    """Check whether an exception from the Gemini client is a quota / overload error."""
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in THROTTLING_ERROR_MARKERS)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus AIMD concurrency limit shared by every Gemini call in the process.
+
+    Every successful call additively raises the request rate and the in-flight limit. A throttled call (429/503)
+    halves both and pauses new requests for `cooldown_seconds`.
+    """
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=10.0, rate_increase=0.1,
+                 initial_concurrency=2, min_concurrency=1, max_concurrency=8,
+                 decrease_factor=0.5, cooldown_seconds=5.0):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_increase = rate_increase
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+
+        self.in_flight = 0
+        self.tokens = 1.0
+        self.successes = 0
+        self.throttled = 0
+        self.failures = 0
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        # Allow a burst of at most one second worth of requests
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until a request is allowed by both the token bucket and the concurrency limit."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.in_flight >= int(self.limit):
+                    wait = None  # woken up by release()
+                elif self.tokens < 1.0:
+                    wait = (1.0 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1.0
+                    self.in_flight += 1
+                    return
+                self._condition.wait(timeout=wait)
+
+    def release(self, throttled=False, failed=False):
+        """Record the outcome of a request and adjust the rate and concurrency limit."""
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._paused_until = time.monotonic() + self.cooldown_seconds
+            elif failed:
+                self.failures += 1
+            else:
+                self.successes += 1
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+                self.rate = min(self.max_rate, self.rate + self.rate_increase)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Context manager wrapping a single Gemini request."""
+        self.acquire()
+        try:
+            yield
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            self.release(throttled=throttled, failed=not throttled)
+            raise
+        else:
+            self.release()
+
+    def stats(self):
+        """Return the current rate, concurrency limit and outcome counters for monitoring."""
+        with self._condition:
+            return {
+                "rate_per_second": round(self.rate, 3),
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+                "successes": self.successes,
+                "throttled": self.throttled,
+                "failures": self.failures,
+            }
@@ -1,16 +1,103 @@
 import json
 import re
+import threading
+from collections import defaultdict
 
+_json_decoder = json.JSONDecoder()
 
-def extract_json_objects(response_text):
+# Parse outcomes per parameter, so a prompt that keeps producing unparsable answers shows up in /llm-stats
+_parse_counts = defaultdict(lambda: {"parsed": 0, "failed": 0})
+_parse_counts_lock = threading.Lock()
+
+
+def _strip_trailing_commas(text):
+    # Several prompt templates end their objects with a trailing comma, which the model tends to copy. String
+    # literals are matched first and kept as they are, so a ", ]" inside a value is never touched.
+    return re.sub(r'"(?:\\.|[^"\\])*"|,\s*([}\]])',
+                  lambda match: match.group(1) if match.group(1) is not None else match.group(0), text)
+
+
+def _object_end(text, start):
+    # Index just past the object that opens at `start`, skipping braces inside strings
+    depth, in_string, escaped = 0, False, False
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+    return len(text)
+
+
+def _loads_tolerant(text):
+    """json.loads that also accepts trailing commas and prose after the object."""
     try:
-        json_objects = []
-        matches = re.findall(r'```json\s*({.*?})\s*```', response_text, re.DOTALL)
-        for match in matches:
-            json_objects.append(json.loads(match))
-        return json_objects
-    except json.JSONDecodeError as e:
-        return f"JSON decoding error: {e}"
+        return _json_decoder.raw_decode(text.strip())[0]
+    except json.JSONDecodeError:
+        return _json_decoder.raw_decode(_strip_trailing_commas(text.strip()))[0]
+
+
+def _find_bare_json_objects(response_text):
+    # Structured-output answers (and models that forget the fence) return bare JSON, possibly surrounded by prose
+    json_objects = []
+    position = response_text.find("{")
+    while position != -1:
+        try:
+            obj, end = _json_decoder.raw_decode(response_text, position)
+        except json.JSONDecodeError:
+            # Only an object that does not parse as it is gets its trailing commas removed
+            end = _object_end(response_text, position)
+            try:
+                obj = _loads_tolerant(response_text[position:end])
+            except json.JSONDecodeError:
+                position = response_text.find("{", position + 1)
+                continue
+        if isinstance(obj, dict):
+            json_objects.append(obj)
+        position = response_text.find("{", end)
+    return json_objects
+
+
+def extract_json_objects(response_text):
+    """
+    Return every JSON object in a Gemini answer.
+
+    ```json fenced blocks are preferred; if there are none, bare objects in the text are used instead. Returns an
+    empty list when nothing can be parsed.
+    """
+    json_objects = []
+    for match in re.findall(r'```(?:json)?\s*({.*?})\s*```', str(response_text), re.DOTALL):
+        try:
+            json_objects.append(_loads_tolerant(match))
+        except json.JSONDecodeError:
+            continue
+    return json_objects or _find_bare_json_objects(str(response_text))
+
+
+def record_parse(parameter, parsed):
+    """Count a parsed or unparsable Gemini answer for `parameter`."""
+    with _parse_counts_lock:
+        _parse_counts[parameter]["parsed" if parsed else "failed"] += 1
+
+
+def get_parse_stats():
+    """Return parsed/failed counters and the failure rate of Gemini answers per parameter."""
+    with _parse_counts_lock:
+        return {
+            parameter: {**counts, "failure_rate": round(counts["failed"] / (counts["parsed"] + counts["failed"]), 4)}
+            for parameter, counts in _parse_counts.items()
+        }
 
 
 def clean_text(text):
@@ -19,3 +106,24 @@ def clean_text(text):
         if text.startswith(prefix) and text.endswith(suffix):
             text = text[len(prefix):-len(suffix)]
     return text
+
+
+def split_fused_response(json_objects, section_names):
+    """
+    Split the answer to a fused prompt into one JSON object per section.
+
+    The model is asked for a single object keyed by section name. If it returned one block per section instead,
+    the blocks are matched to the sections in order.
+    """
+    if not isinstance(json_objects, list) or not json_objects:
+        raise ValueError(f"No JSON object found in fused response: {json_objects}")
+
+    combined = json_objects[0]
+    if all(name in combined for name in section_names):
+        return {name: combined[name] for name in section_names}
+
+    if len(json_objects) == len(section_names):
+        return dict(zip(section_names, json_objects))
+
+    missing = [name for name in section_names if name not in combined]
+    raise KeyError(f"Fused response is missing sections: {missing}")
@@ -0,0 +1,184 @@
+import os
+import sqlite3
+from datetime import date, datetime
+
+
+class MSSQLBackend:
+    """SQL Server through pyodbc, the production database."""
+    name = "mssql"
+
+    def __init__(self, server, username, password, driver):
+        self.server = server
+        self.username = username
+        self.password = password
+        self.driver = driver
+
+    def connect(self, database):
+        import pyodbc  # only needed for the real database
+        return pyodbc.connect(
+            f"DRIVER={self.driver};SERVER={self.server};DATABASE={database};UID={self.username};PWD={self.password};"
+        )
+
+    @staticmethod
+    def temp_table(name):
+        return f"#{name}"
+
+    @staticmethod
+    def select_top(n, select_body):
+        return f"SELECT TOP {n} {select_body}"
+
+    @staticmethod
+    def drop_table_if_exists(table):
+        if table.startswith("#"):
+            return f"IF OBJECT_ID('tempdb..{table}') IS NOT NULL DROP TABLE {table}"
+        return f"IF OBJECT_ID('{table}') IS NOT NULL DROP TABLE {table}"
+
+    def create_id_table(self, table, source_table, source_column):
+        """Statements creating an indexed one-column `id` temp table typed like `source_table.source_column`."""
+        return [
+            f"SELECT TOP 0 {source_column} AS id INTO {table} FROM {source_table}",
+            f"CREATE CLUSTERED INDEX ix_id ON {table} (id)",
+        ]
+
+    def upsert(self, conn, table, columns, key_columns, hashed_columns, rows, bulk_insert):
+        """
+        Stage `rows` in a session temp table and MERGE them into `table`.
+
+        Existing keys are only updated when the HASHBYTES of `hashed_columns` differs. Returns inserted/updated counts.
+        Needs SQL Server 2017 or later (CONCAT_WS).
+        """
+        stage = self.temp_table(f"stage_{table}")
+        column_list = ", ".join(f"[{column}]" for column in columns)
+
+        def content_hash(alias):
+            # CONCAT_WS skips NULLs, so every value is tagged: N'v' + value, or N'n' for NULL. Otherwise
+            # (NULL, 'x') and ('x', NULL) would hash the same
+            values = ", ".join(f"COALESCE(N'v' + CAST({alias}.[{column}] AS NVARCHAR(MAX)), N'n')"
+                               for column in hashed_columns)
+            return f"HASHBYTES('SHA2_256', CONCAT_WS(NCHAR(31), {values}))"
+
+        merge_query = f"""
+            MERGE {table} WITH (HOLDLOCK) AS t
+            USING (
+                SELECT {column_list} FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY {", ".join(f"[{k}]" for k in key_columns)}
+                                                 ORDER BY stage_row DESC) AS stage_rank
+                    FROM {stage}
+                ) ranked WHERE stage_rank = 1
+            ) AS s
+            ON {" AND ".join(f"t.[{k}] = s.[{k}]" for k in key_columns)}
+            WHEN MATCHED AND {content_hash("t")} <> {content_hash("s")} THEN
+                UPDATE SET {", ".join(f"[{c}] = s.[{c}]" for c in columns if c not in key_columns)}
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT ({column_list}) VALUES ({", ".join(f"s.[{c}]" for c in columns)})
+            OUTPUT $action;
+        """
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(self.drop_table_if_exists(stage))
+            cursor.execute(f"SELECT TOP 0 {column_list} INTO {stage} FROM {table}")
+            cursor.execute(f"ALTER TABLE {stage} ADD stage_row INT IDENTITY(1, 1)")
+            bulk_insert(conn, f"INSERT INTO {stage} ({column_list}) VALUES ({', '.join('?' * len(columns))})", rows)
+            cursor.execute(merge_query)
+            actions = [row[0] for row in cursor.fetchall()]
+            cursor.execute(f"DROP TABLE {stage}")
+        finally:
+            cursor.close()
+        return {"inserted": actions.count("INSERT"), "updated": actions.count("UPDATE")}
+
+
+class SQLiteBackend:
+    """
+    Local SQLite files standing in for the SQL Server databases, for offline runs and benchmarks.
+
+    Every database name maps to `<directory>/<database>.sqlite`; seed_local_database.py creates and fills them.
+    """
+    name = "sqlite"
+
+    def __init__(self, directory):
+        self.directory = directory
+        sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+        sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+    def path(self, database):
+        return os.path.join(self.directory, f"{database or 'cred'}.sqlite")
+
+    def connect(self, database):
+        os.makedirs(self.directory, exist_ok=True)
+        # Pooled connections move between threads; SQLite serialises the writes itself
+        conn = sqlite3.connect(self.path(database), check_same_thread=False, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def temp_table(name):
+        return f"temp_{name}"
+
+    @staticmethod
+    def select_top(n, select_body):
+        return f"SELECT {select_body.rstrip().rstrip(';')} LIMIT {n}"
+
+    @staticmethod
+    def drop_table_if_exists(table):
+        return f"DROP TABLE IF EXISTS {table}"
+
+    def create_id_table(self, table, source_table, source_column):
+        return [
+            f"CREATE TEMP TABLE {table} AS SELECT {source_column} AS id FROM {source_table} LIMIT 0",
+            f"CREATE INDEX {table}_id ON {table} (id)",
+        ]
+
+    def upsert(self, conn, table, columns, key_columns, hashed_columns, rows, bulk_insert):
+        """INSERT ... ON CONFLICT DO UPDATE, only touching rows whose `hashed_columns` changed."""
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        changed = " OR ".join(f'"{c}" IS NOT excluded."{c}"' for c in hashed_columns)
+        before = conn.total_changes
+        bulk_insert(conn, f"""
+            INSERT INTO {table} ({column_list}) VALUES ({', '.join('?' * len(columns))})
+            ON CONFLICT ({", ".join(f'"{k}"' for k in key_columns)}) DO UPDATE SET
+                {", ".join(f'"{c}" = excluded."{c}"' for c in columns if c not in key_columns)}
+            WHERE {changed}
+        """, rows)
+        # SQLite does not tell inserts and updates apart
+        return {"written": conn.total_changes - before}
+
+
+def _columns_ddl(columns, types=None):
+    types = types or {}
+    return ", ".join(f'"{column}" {types.get(column, "TEXT")}' for column in columns)
+
+
+def sqlite_schema(brcp_data_columns, softskill_columns):
+    """DDL of every table the pipeline reads or writes, for the SQLite stand-in."""
+    return [
+        """CREATE TABLE IF NOT EXISTS Conversation_ID_List (
+            id INTEGER PRIMARY KEY, uploaded_id TEXT NOT NULL, created_on TEXT NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS tPrimaryInfo (
+            conversation_id TEXT, request_id TEXT PRIMARY KEY, uploaded_id TEXT, uploaded_on TEXT,
+            Time_duration_of_Call REAL, Total_instance_long_dead_Air INTEGER,
+            Total_instance_short_dead_Air INTEGER)""",
+        "CREATE INDEX IF NOT EXISTS IX_tPrimaryInfo_uploaded_id ON tPrimaryInfo (uploaded_id)",
+        "CREATE INDEX IF NOT EXISTS IX_tPrimaryInfo_uploaded_on ON tPrimaryInfo (uploaded_on)",
+        "CREATE TABLE IF NOT EXISTS tTranscript (request_id TEXT PRIMARY KEY, transcript TEXT)",
+        """CREATE TABLE IF NOT EXISTS tutterances (
+            id INTEGER PRIMARY KEY, request_id TEXT, speaker TEXT, transcript TEXT, starttime TEXT, Endtime TEXT,
+            Holddiff TEXT, Dear_Air_short INTEGER, Dear_Air_long INTEGER)""",
+        "CREATE INDEX IF NOT EXISTS IX_tutterances_request_id ON tutterances (request_id, id)",
+        """CREATE TABLE IF NOT EXISTS interactiondb (
+            conversationid TEXT PRIMARY KEY, totalholdtime REAL, calldisconnectionby TEXT, surveypoint TEXT)""",
+        f"CREATE TABLE IF NOT EXISTS brcpData ({_columns_ddl(brcp_data_columns)})",
+        "CREATE UNIQUE INDEX IF NOT EXISTS UX_brcpData_key ON brcpData (request_id, Uploaded_id)",
+        f"CREATE TABLE IF NOT EXISTS softskill ({_columns_ddl(softskill_columns)})",
+        "CREATE UNIQUE INDEX IF NOT EXISTS UX_softskill_key ON softskill (request_id)",
+    ]
+
+
+def create_backend(name, **settings):
+    """Build the backend selected by DB_BACKEND ("mssql" or "sqlite")."""
+    if name == "sqlite":
+        return SQLiteBackend(settings.get("sqlite_directory") or "local_db")
+    if name == "mssql":
+        return MSSQLBackend(settings.get("server"), settings.get("username"), settings.get("password"),
+                            settings.get("driver"))
+    raise ValueError(f"Unknown DB_BACKEND: {name}")
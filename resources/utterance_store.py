@@ -0,0 +1,79 @@
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = "string[pyarrow]"  # one contiguous Arrow buffer per column instead of a Python str per value
+except ModuleNotFoundError:  # listed in requirements.txt; without it the text columns keep Python objects
+    TEXT_DTYPE = "object"
+
+# Timing columns of tutterances, in seconds from the start of the call
+UTTERANCE_NUMERIC_COLUMNS = ['starttime', 'Endtime', 'Holddiff']
+UTTERANCE_TEXT_COLUMNS = ['transcript']
+UTTERANCE_SORT_COLUMNS = ['request_id', 'id']
+
+
+def apply_load_dtypes(frame, numeric_columns=(), text_columns=(), float_columns=()):
+    """
+    Convert freshly fetched columns in place: `numeric_columns` with pd.to_numeric (invalid values become NaN),
+    `float_columns` likewise but always as float64, and `text_columns` to TEXT_DTYPE. Missing columns are skipped.
+    """
+    for column in numeric_columns:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce')
+    for column in float_columns:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype('float64')
+    if TEXT_DTYPE != "object":
+        for column in text_columns:
+            if column in frame.columns:
+                frame[column] = frame[column].astype(TEXT_DTYPE)
+    return frame
+
+
+class UtteranceStore:
+    """
+    Typed store of the tutterances rows of a day, grouped by request_id, filled chunk by chunk while the query
+    result is streamed.
+
+    Each chunk is converted as it arrives (timing columns to float64, the utterance text to TEXT_DTYPE), so only one
+    chunk of raw Python objects is alive at a time. The query delivers the rows ordered by request_id and id, so
+    every call's utterances are contiguous and to_frame() only concatenates the chunks; they are sorted only if the
+    order check in append() fails. The converted rows of the whole day are kept, since the softskill analysis
+    reads them all at once.
+    """
+
+    def __init__(self, numeric_columns=None, text_columns=None):
+        self.numeric_columns = numeric_columns or UTTERANCE_NUMERIC_COLUMNS
+        self.text_columns = text_columns or UTTERANCE_TEXT_COLUMNS
+        self._chunks = []
+        self._last_key = None
+        self._ordered = True
+
+    def append(self, chunk):
+        """Add a chunk of raw tutterances rows; the chunk is converted in place."""
+        chunk = apply_load_dtypes(chunk, float_columns=self.numeric_columns, text_columns=self.text_columns)
+        if chunk.empty:
+            return
+        if self._ordered and all(column in chunk.columns for column in UTTERANCE_SORT_COLUMNS):
+            keys = pd.MultiIndex.from_frame(chunk[UTTERANCE_SORT_COLUMNS])
+            try:
+                self._ordered = keys.is_monotonic_increasing and (self._last_key is None or self._last_key <= keys[0])
+            except TypeError:  # mixed key types cannot be compared, sort in to_frame() instead
+                self._ordered = False
+            self._last_key = keys[-1]
+        else:
+            self._ordered = False
+        self._chunks.append(chunk)
+
+    def to_frame(self):
+        """All rows as one DataFrame, sorted by request_id and id."""
+        if not self._chunks:
+            return pd.DataFrame()
+        frame = pd.concat(self._chunks, ignore_index=True) if len(self._chunks) > 1 else self._chunks[0]
+        if not self._ordered:
+            sort_columns = [column for column in UTTERANCE_SORT_COLUMNS if column in frame.columns]
+            if sort_columns:
+                frame = frame.sort_values(by=sort_columns, kind='mergesort').reset_index(drop=True)
+        # Keep only the combined frame, the chunks are not needed any more
+        self._chunks = [frame]
+        return frame
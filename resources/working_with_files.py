@@ -116,10 +116,14 @@ def categorize_missing_columns(missing_cols):
 
     return categories
 
+def now_ist():
+    """Current IST time as a naive datetime, comparable with the timestamps stored in the database."""
+    return datetime.now(pytz.timezone('Asia/Kolkata')).replace(tzinfo=None)
+
+
 def get_time():
     """Get the current IST time formatted as '01_April_2025_558PM'."""
-    ist = pytz.timezone('Asia/Kolkata')
-    current_time = datetime.now(ist) - timedelta(hours=1)
+    current_time = now_ist() - timedelta(hours=1)
     return current_time.strftime("%d_%B_%Y_%I%M%p")
 
 
@@ -14,7 +14,7 @@ def install_requirements():
         print("Dependencies installed successfully.")
 
 
-# Function to run the Python script
+# Function to run the Python script (BRCP in backlog mode, so missed uploads are caught up)
 def run_script():
     print("\n=== Running Script at:", time.strftime('%Y-%m-%d %H:%M:%S'), "===")
 
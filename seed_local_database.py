@@ -0,0 +1,115 @@
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from fetchData import (backend, bulk_insert, INPUT_DATABASE, OUTPUT_DATABASE, BRCP_DATA_COLUMNS,
+                       SOFTSKILL_COLUMNS)
+from resources.phrases import feedback_phrases, disconnect_phrases_en, survey_phrases
+from resources.sql_backend import sqlite_schema
+
+# Creates the local SQLite stand-in databases and fills them with synthetic calls, for offline end-to-end runs:
+#   DB_BACKEND=sqlite python seed_local_database.py --uploads 4 --calls 250 --date 2025-04-02
+#   DB_BACKEND=sqlite LLM_BACKEND=fake uvicorn main:app
+
+AGENT_LINES = [
+    "Thank you for calling, my name is Riya, how may I help you today?",
+    "I understand your concern, let me check that for you.",
+    "May I place your call on hold for a minute while I check the details?",
+    "Thank you for holding, I have checked your account.",
+    "I apologise for the inconvenience caused.",
+    "The payment will be reflected in your account within 24 hours.",
+    "Is there anything else I can help you with?",
+] + feedback_phrases[:3] + disconnect_phrases_en + survey_phrases
+CUSTOMER_LINES = [
+    "Hello, my payment failed but the amount was debited.",
+    "I have been waiting for the refund for a week now.",
+    "Okay, please check.",
+    "Why does this keep happening every month?",
+    "Yes, that is all, thank you.",
+    "Can I talk to your supervisor?",
+]
+
+
+def make_call(rng, request_id, utterances_per_call, first_utterance_id):
+    """Utterance rows (tutterances) and the joined transcript text (tTranscript) of one synthetic call."""
+    rows, lines, clock = [], [], 0.0
+    for i in range(utterances_per_call):
+        agent = i % 2 == 0
+        text = rng.choice(AGENT_LINES if agent else CUSTOMER_LINES)
+        start = clock + rng.uniform(0.5, 12.0 if i else 6.0)
+        end = start + rng.uniform(1.5, 8.0)
+        hold = rng.choice([0, 0, 0, rng.randint(20, 180)])
+        dead_air_short = int(rng.random() < 0.05)
+        dead_air_long = int(not dead_air_short and rng.random() < 0.02)
+        rows.append((first_utterance_id + i, request_id, "00" if agent else "01", text, f"{start:.2f}",
+                     f"{end:.2f}", str(hold), dead_air_short, dead_air_long))
+        lines.append(f"{'Agent' if agent else 'Customer'}: {text}")
+        clock = end + hold
+    return rows, "\n".join(lines), clock
+
+
+def seed(uploads, calls_per_upload, utterances_per_call, day, seed_value):
+    rng = random.Random(seed_value)
+    databases = {INPUT_DATABASE, OUTPUT_DATABASE}
+    for database in databases:
+        conn = backend.connect(database)
+        for statement in sqlite_schema(BRCP_DATA_COLUMNS, SOFTSKILL_COLUMNS):
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+
+    upload_rows, primary_rows, transcript_rows, utterance_rows, interaction_rows = [], [], [], [], []
+    start_of_day = datetime.combine(day, datetime.min.time())
+    for upload in range(uploads):
+        uploaded_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        created_on = start_of_day + timedelta(hours=(upload + 1) * 24 / (uploads + 1))
+        for _ in range(calls_per_upload):
+            request_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            conversation_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            rows, transcript, duration = make_call(rng, request_id, utterances_per_call, len(utterance_rows) + 1)
+            upload_rows.append((len(upload_rows) + 1, uploaded_id, created_on))
+            primary_rows.append((conversation_id, request_id, uploaded_id, created_on, round(duration, 2),
+                                 sum(row[8] for row in rows), sum(row[7] for row in rows)))
+            transcript_rows.append((request_id, transcript))
+            utterance_rows.extend(rows)
+            interaction_rows.append((conversation_id, float(rng.choice([0, 0, 30, 95, 240])),
+                                     rng.choice(["Agent", "Customer"]), str(rng.randint(1, 5))))
+
+    tables = [
+        (INPUT_DATABASE, "Conversation_ID_List", ["id", "uploaded_id", "created_on"], upload_rows),
+        (INPUT_DATABASE, "tPrimaryInfo", ["conversation_id", "request_id", "uploaded_id", "uploaded_on",
+                                          "Time_duration_of_Call", "Total_instance_long_dead_Air",
+                                          "Total_instance_short_dead_Air"], primary_rows),
+        (INPUT_DATABASE, "tTranscript", ["request_id", "transcript"], transcript_rows),
+        (INPUT_DATABASE, "tutterances", ["id", "request_id", "speaker", "transcript", "starttime", "Endtime",
+                                         "Holddiff", "Dear_Air_short", "Dear_Air_long"], utterance_rows),
+        (OUTPUT_DATABASE, "interactiondb", ["conversationid", "totalholdtime", "calldisconnectionby",
+                                            "surveypoint"], interaction_rows),
+    ]
+    for database, table, columns, rows in tables:
+        conn = backend.connect(database)
+        # Ids continue after the rows of earlier seeding runs
+        if table in ("Conversation_ID_List", "tutterances"):
+            offset = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            rows = [(row[0] + offset,) + row[1:] for row in rows]
+        bulk_insert(conn, f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows)
+        conn.commit()
+        conn.close()
+        print(f"{table}: {len(rows)} rows -> {backend.path(database)}")
+
+
+if __name__ == "__main__":
+    if backend.name != "sqlite":
+        raise SystemExit("Set DB_BACKEND=sqlite; seeding only writes to the local stand-in databases.")
+    parser = argparse.ArgumentParser(description="Seed the local SQLite databases with synthetic calls.")
+    parser.add_argument("--uploads", type=int, default=2, help="Conversation_ID_List uploads")
+    parser.add_argument("--calls", type=int, default=100, help="calls per upload")
+    parser.add_argument("--utterances-per-call", type=int, default=40)
+    parser.add_argument("--date", default=(datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
+                        help="upload day, YYYY-MM-DD (default: yesterday, what /softskill scores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    seed(args.uploads, args.calls, args.utterances_per_call, datetime.strptime(args.date, "%Y-%m-%d").date(),
+         args.seed)
@@ -0,0 +1,7 @@
+-- Indexes the pipeline relies on in the SQL Server input database. Safe to run more than once.
+
+-- is_uid_in_primaryinfo probes SELECT TOP 1 1 FROM tPrimaryInfo WHERE uploaded_id = ?, an index seek with this index
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_tPrimaryInfo_uploaded_id' AND object_id = OBJECT_ID('dbo.tPrimaryInfo'))
+    CREATE NONCLUSTERED INDEX IX_tPrimaryInfo_uploaded_id ON dbo.tPrimaryInfo (uploaded_id);
+GO
@@ -0,0 +1,55 @@
+import pytest
+
+from resources.classifier_specs import CLASSIFIER_SPECS, CHAT_CLOSING_SPEC
+
+ERROR = ValueError("No JSON object found")
+LONG_CALL_ERROR = RuntimeError("500 An internal error has occurred")
+
+# Columns of the rows written for failed calls, per parameter: (any error, Gemini's "too long" 500)
+ERROR_ROW_COLUMNS = {
+    'RudeSarcastic': (['Sarcasm_rude_behaviour', 'Sarcasm_rude_behaviour_evidence'],) * 2,
+    'Escalation': (['escalation_results', 'Issue_Identification', 'Probable_Reason_for_Escalation',
+                    'Probable_Reason_for_Escalation_Evidence', 'Agent_Handling_Capability'],) * 2,
+    'Supervisor': (['Wanted_to_connect_with_supervisor', 'de_escalate', 'Supervisor_call_connected',
+                    'call_back_arranged_from_supervisor', 'supervisor_evidence', 'Denied_for_Supervisor_call',
+                    'denied_evidence'],) * 2,
+    'ApologyEmpathy': (['Apology_result', 'Apology_evidence', 'Empathy_result', 'Empathy_evidence',
+                        'Apology_Category', 'Empathy_Category'],) * 2,
+    'UnethicalSolicitation': (['Unethical_Solicitation', 'Unethical_Solicitation_Evidence'],) * 2,
+    'Reassurance': (['Reassurance_result', 'Reassurance_evidence', 'Reassurance_Category'],) * 2,
+    'ChatClosing': (['Further Assistance', 'Further Assistance Evidence', 'Effective IVR Survey',
+                     'Effective IVR Survey Evidence', 'Branding', 'Branding Evidence', 'Greeting',
+                     'Greeting Evidence'],) * 2,
+    'ChatOpening': (['Greeting_the_customer', 'Greeting_the_customer_evidence', 'Self_introduction',
+                     'Self_introduction_evidence', 'Identity_confirmation', 'Identity_confirmation_evidence'],) * 2,
+    'DSAT': (['Customer_Issue_Identification', 'Reason_for_DSAT', 'Suggestion_for_DSAT_Prevention'],) * 2,
+    'VoiceOfCustomer': (['VOC_Category', 'VOC_Core_Issue_Summary'],) * 2,
+    'OpeningLang': (['Open the call in default language', 'Open the call in default language evidence',
+                     'Open the call in default language Reason'],) * 2,
+    'TimelyClosing': (['Category', 'Summary', 'Supporting_Evidence'],) * 2,
+    'Personalization': (['Personalization_result', 'Personalization_Evidence'],) * 2,
+}
+
+
+def test_error_rows_have_the_result_columns():
+    for spec in CLASSIFIER_SPECS.values():
+        assert list(spec.failure_row(ERROR)) == list(spec.columns)
+        assert list(spec.failure_row(LONG_CALL_ERROR)) == list(spec.columns)
+
+
+def test_every_spec_is_pinned():
+    assert set(ERROR_ROW_COLUMNS) == set(CLASSIFIER_SPECS)
+
+
+@pytest.mark.parametrize("name", sorted(ERROR_ROW_COLUMNS))
+def test_error_row_columns(name):
+    spec = CLASSIFIER_SPECS[name]
+    error_columns, long_call_columns = ERROR_ROW_COLUMNS[name]
+    assert list(spec.failure_row(ERROR)) == error_columns
+    assert list(spec.failure_row(LONG_CALL_ERROR)) == long_call_columns
+
+
+def test_error_message_fills_the_placeholder():
+    row = CHAT_CLOSING_SPEC.failure_row(ERROR)
+    assert row['Further Assistance'] == "Error"
+    assert row['Further Assistance Evidence'] == str(ERROR)
@@ -0,0 +1,29 @@
+from resources.result_extractor_cleaner import extract_json_objects
+
+
+def test_fenced_block():
+    assert extract_json_objects('Answer:\n```json\n{"result": "Met"}\n```') == [{"result": "Met"}]
+
+
+def test_bare_objects_around_prose():
+    text = 'First {"a": 1} then {"b": {"c": 2}} done'
+    assert extract_json_objects(text) == [{"a": 1}, {"b": {"c": 2}}]
+
+
+def test_trailing_commas_are_tolerated():
+    assert extract_json_objects('{"a": "Met", "b": ["x", "y",],}') == [{"a": "Met", "b": ["x", "y"]}]
+
+
+def test_valid_json_string_values_are_not_changed():
+    assert extract_json_objects('{"ev": "he said, ]"}') == [{"ev": "he said, ]"}]
+    assert extract_json_objects('```json\n{"ev": "he said, }"}\n```') == [{"ev": "he said, }"}]
+
+
+def test_trailing_comma_fallback_keeps_string_values():
+    assert extract_json_objects('{"ev": "he said, ]", "r": "Met",}') == [{"ev": "he said, ]", "r": "Met"}]
+    assert extract_json_objects('{"ev": "a \\"quoted, }\\" word",} and {"x": 1}') == [
+        {"ev": 'a "quoted, }" word'}, {"x": 1}]
+
+
+def test_unparsable_text_gives_empty_list():
+    assert extract_json_objects("no json here {oops") == []
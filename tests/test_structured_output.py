@@ -0,0 +1,66 @@
+import pytest
+
+from resources.classifier_specs import CLASSIFIER_SPECS, BRCP_FUSED_SECTIONS, ESCALATION_SPEC, \
+    fused_response_schema, structured_output_config
+from resources.fake_llm import FakeGeminiLLM
+from resources.prompts import build_fused_prompt
+from resources.result_extractor_cleaner import extract_json_objects, split_fused_response
+
+FUSED_SPECS = [CLASSIFIER_SPECS[name] for name in BRCP_FUSED_SECTIONS]
+
+
+def fake_llm():
+    return FakeGeminiLLM(latency_distribution="none", seed=7)
+
+
+def test_spec_schema_uses_gemini_type_names():
+    config = structured_output_config(ESCALATION_SPEC.response_schema())
+    schema = config["response_schema"]
+    assert config["response_mime_type"] == "application/json"
+    assert schema["type"] == "OBJECT"
+    assert {field["type"] for field in schema["properties"].values()} == {"STRING"}
+    assert schema["required"] == list(ESCALATION_SPEC.columns.values())
+
+
+def test_fused_schema_nests_one_object_per_section():
+    schema = structured_output_config(fused_response_schema(FUSED_SPECS))["response_schema"]
+    assert schema["required"] == BRCP_FUSED_SECTIONS
+    for spec in FUSED_SPECS:
+        assert schema["properties"][spec.name]["type"] == "OBJECT"
+        assert list(schema["properties"][spec.name]["properties"]) == list(dict.fromkeys(spec.columns.values()))
+
+
+@pytest.mark.parametrize("schema", [ESCALATION_SPEC.response_schema(), fused_response_schema(FUSED_SPECS)],
+                         ids=["spec", "fused"])
+def test_sdk_accepts_the_generation_config(schema):
+    # ChatGoogleGenerativeAI.invoke(generation_config=...) builds exactly this message from the dict
+    glm = pytest.importorskip("google.ai.generativelanguage_v1beta")
+    config = glm.GenerationConfig(**structured_output_config(schema))
+    assert config.response_mime_type == "application/json"
+    assert config.response_schema.type == glm.Type.OBJECT
+    assert list(config.response_schema.required) == schema["required"]
+
+
+def test_sdk_rejects_json_schema_type_names():
+    glm = pytest.importorskip("google.ai.generativelanguage_v1beta")
+    with pytest.raises(KeyError):
+        glm.GenerationConfig(response_mime_type="application/json", response_schema=ESCALATION_SPEC.response_schema())
+
+
+def test_spec_round_trip_through_fake():
+    answer = fake_llm().invoke("transcript\n\n" + ESCALATION_SPEC.prompt,
+                               generation_config=structured_output_config(ESCALATION_SPEC.response_schema()))
+    assert not answer.content.startswith("```")  # JSON mode answers with bare JSON
+    extracted = extract_json_objects(answer.content)[0]
+    assert set(extracted) == set(ESCALATION_SPEC.columns.values())
+    assert list(ESCALATION_SPEC.result_row(extracted)) == list(ESCALATION_SPEC.columns)
+
+
+def test_fused_round_trip_through_fake():
+    prompt = build_fused_prompt([(spec.name, spec.prompt) for spec in FUSED_SPECS])
+    answer = fake_llm().invoke("transcript\n\n" + prompt,
+                               generation_config=structured_output_config(fused_response_schema(FUSED_SPECS)))
+    sections = split_fused_response(extract_json_objects(answer.content), BRCP_FUSED_SECTIONS)
+    for spec in FUSED_SPECS:
+        assert set(sections[spec.name]) == set(spec.columns.values())
+        assert list(spec.result_row(sections[spec.name])) == list(spec.columns)